@@ -0,0 +1,92 @@
+#!/bin/python
+
+"""Microbenchmark of the parsers built on yahoo_fantasy_api.extract
+
+Compares them against the objectpath queries they replaced, using the
+player stats, transactions and draft results in the test fixtures.
+
+    PYTHONPATH=. python benchmarks/bench_extract.py
+"""
+
+import json
+import os
+import timeit
+
+import objectpath
+
+from yahoo_fantasy_api.league import League
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                           '..', 'yahoo_fantasy_api', 'tests')
+NUMBER = 200
+
+
+def load(fn):
+    with open(os.path.join(FIXTURE_DIR, fn), 'r') as f:
+        return json.load(f)
+
+
+def legacy_plyr_stats(stats_id_map, doc):
+    t = objectpath.Tree(doc)
+    stats = []
+    row = None
+    for e in t.execute('$..(full,player_id,position_type,stat,total)'):
+        if 'player_id' in e:
+            if row is not None:
+                stats.append(row)
+            row = {'player_id': int(e['player_id'])}
+        elif 'full' in e:
+            row['name'] = e['full']
+        elif 'position_type' in e:
+            row['position_type'] = e['position_type']
+        elif 'stat' in e:
+            stat_id = int(e['stat']['stat_id'])
+            try:
+                val = float(e['stat']['value'])
+            except ValueError:
+                val = e['stat']['value']
+            if stat_id in stats_id_map:
+                row[stats_id_map[stat_id]] = val
+        elif 'total' in e:
+            row['total_points'] = e['total']
+    if row is not None:
+        stats.append(row)
+    return stats
+
+
+def legacy_transactions(doc):
+    t = objectpath.Tree(doc).execute('$..transactions..transaction')
+    transactions = []
+    for transaction_details in t:
+        players = next(t)
+        transactions.append({**transaction_details, **players})
+    return transactions
+
+
+def main():
+    lg = League(None, '396.l.21484', handler=object())
+    lg.stats_id_map = {i: 'stat{}'.format(i) for i in range(2000)}
+    stats = load('sample.player_stats.396.l.21484.json')
+    transactions = load('sample.transactions.json')
+
+    assert lg._plyr_stats_from_json(stats) == \
+        legacy_plyr_stats(lg.stats_id_map, stats)
+    assert lg._transactions_from_json(transactions) == \
+        legacy_transactions(transactions)
+
+    cases = [
+        ('player stats', stats,
+         lambda d: legacy_plyr_stats(lg.stats_id_map, d),
+         lg._plyr_stats_from_json),
+        ('transactions', transactions, legacy_transactions,
+         lg._transactions_from_json),
+    ]
+    for (case, doc, legacy, current) in cases:
+        for name, fn in [('objectpath', legacy), ('extract', current)]:
+            secs = timeit.timeit(lambda: fn(doc), number=NUMBER)
+            print("{:>12} {:>10}: {:8.3f} ms".format(
+                case, name, secs / NUMBER * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/bin/python
+
+"""Microbenchmark of League._players_from_page
+
+Compares the single pass extractor against the objectpath based parser it
+replaced, using the free agent pages in the test fixtures.
+
+    PYTHONPATH=. python benchmarks/bench_players_from_page.py
+"""
+
+import json
+import os
+import timeit
+
+import objectpath
+
+from yahoo_fantasy_api.league import League
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                           '..', 'yahoo_fantasy_api', 'tests')
+NUMBER = 200
+
+
+def legacy_players_from_page(page):
+    """The objectpath based parser, kept here for comparison"""
+    fa = []
+    if len(page['fantasy_content']['league'][1]['players']) == 0:
+        return (0, fa)
+
+    t = objectpath.Tree(page)
+    po_it = iter(list(t.execute('$..percent_owned.(coverage_type,value)')))
+    pct_owns = []
+    for ele in po_it:
+        if "coverage_type" in ele:
+            pct_owns.append(0)
+        if "value" in ele:
+            pct_owns[-1] = ele['value']
+    for i, pct_own in zip(range(0, t.execute('$..players.count[0]') * 2, 2),
+                          pct_owns):
+        path = '$..players..player[{}].'.format(i) + \
+            "(name,player_id,position_type,status,eligible_positions)"
+        plyr = {}
+        for ele in t.execute(path):
+            plyr.update(ele)
+        plyr['player_id'] = int(plyr['player_id'])
+        plyr['name'] = plyr['name']['full']
+        plyr['eligible_positions'] = [e['position'] for e in
+                                      plyr['eligible_positions']]
+        plyr['percent_owned'] = pct_own
+        if "status" not in plyr:
+            plyr["status"] = ""
+        if plyr["status"] != "NA":
+            fa.append(plyr)
+    return (i / 2 + 1, fa)
+
+
+def main():
+    lg = League(None, '370.l.56877', handler=object())
+    pages = []
+    for pg in range(1, 4):
+        fn = os.path.join(FIXTURE_DIR,
+                          'sample.players.freeagents.C.pg.{}.json'.format(pg))
+        with open(fn, 'r') as f:
+            pages.append(json.load(f))
+
+    for page in pages:
+        assert lg._players_from_page(page) == legacy_players_from_page(page)
+
+    for name, fn in [('objectpath', legacy_players_from_page),
+                     ('single pass', lg._players_from_page)]:
+        secs = timeit.timeit(lambda: [fn(p) for p in pages], number=NUMBER)
+        print("{:>12}: {:8.3f} ms per 3 pages".format(
+            name, secs / NUMBER * 1000))
+
+
+if __name__ == '__main__':
+    main()
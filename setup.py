@@ -25,8 +25,9 @@ setup(name='yahoo_fantasy_api',
           'License :: OSI Approved :: MIT License',
           'Programming Language :: Python :: 3.7',
       ],
-      install_requires=['objectpath', 'pytz', 'yahoo_oauth',
+      install_requires=['pytz', 'yahoo_oauth', 'requests',
                         'docopt'],
+      extras_require={'async': ['aiohttp'], 'fastjson': ['orjson']},
       python_requires='>=3',
       zip_safe=False,
       scripts=['yahoo_fantasy_api/scripts/yfa_draft_results',
@@ -1,3 +1,32 @@
-from .game import Game
-from .league import League
-from .team import Team
+import importlib
+
+# The classes are imported from their submodule the first time they are used,
+# so importing the package itself stays cheap for short lived processes.
+_EXPORTS = {
+    'Game': 'game',
+    'League': 'league',
+    'Team': 'team',
+    'DraftTracker': 'draft',
+    'AsyncGame': 'aio',
+    'AsyncLeague': 'aio',
+    'AsyncTeam': 'aio',
+    'AsyncDraftTracker': 'aio',
+    'YHandler': 'yhandler',
+    'AsyncYHandler': 'yhandler',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name))
+    module = importlib.import_module('.' + _EXPORTS[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,447 @@
+#!/bin/python
+
+import asyncio
+import datetime
+import time
+
+from yahoo_fantasy_api import draft, game, league, team, yhandler
+
+
+class AsyncGame(game.Game):
+    """Asynchronous version of :class:`yahoo_fantasy_api.game.Game`
+
+    The methods that call out to Yahoo! are coroutines.  They return the same
+    structures as the synchronous class.
+
+    :param sc: Fully constructed session context
+    :type sc: :class:`yahoo_oauth.OAuth2`
+    :param code: Sport code (mlb, nhl, etc)
+    :type code: str
+    :param handler: Handler to send the requests through.  If None, the
+        handler shared by the session context is used.  See
+        :func:`yahoo_fantasy_api.yhandler.get_async_handler`.
+    :type handler: AsyncYHandler
+    """
+
+    def __init__(self, sc, code, handler=None):
+        self.sc = sc
+        self.code = code
+        self.yhandler = handler if handler \
+            else yhandler.get_async_handler(sc)
+
+    async def game_id(self):
+        return self._game_id_from_json(
+            await self.yhandler.get_game_raw(self.code))
+
+    def to_league(self, league_id):
+        """Construct an AsyncLeague object from a Game
+
+        :param league_id: League ID of the new League to construct
+        :type league_id: str
+        :return: Fully constructed object
+        :rtype: AsyncLeague
+        """
+        return AsyncLeague(self.sc, league_id, handler=self.yhandler)
+
+    async def leagues_bulk(self, league_ids,
+                           resources=('settings', 'standings', 'scoreboard')):
+        self._check_bulk_resources(resources)
+        pages = await asyncio.gather(
+            *[self.yhandler.get_leagues_by_keys_raw(
+                league_ids[i:i + self.LEAGUES_PER_REQUEST], resources)
+              for i in range(0, len(league_ids), self.LEAGUES_PER_REQUEST)])
+        leagues = {}
+        for page in pages:
+            leagues.update(self._leagues_from_bulk_json(page))
+        return leagues
+
+    async def league_ids(self, year=None, is_available=False, game_types=None,
+                         game_codes=None, seasons=None):
+        if year is not None:
+            return self._league_ids_from_teams_json(
+                await self.yhandler.get_teams_raw(), year=year)
+        return self._league_ids_from_json(
+            await self.yhandler.get_leagues_raw(
+                is_available=is_available,
+                game_types=game_types,
+                game_codes=game_codes,
+                seasons=seasons))
+
+
+class AsyncLeague(league.League):
+    """Asynchronous version of :class:`yahoo_fantasy_api.league.League`
+
+    The methods that call out to Yahoo! are coroutines.  They return the same
+    structures as the synchronous class.
+
+    :param sc: Fully constructed session context
+    :type sc: :class:`yahoo_oauth.OAuth2`
+    :param league_id: League ID to setup this class for.  All API requests
+        will be for this league.
+    :type league_id: str
+    :param handler: Handler to send the requests through.  If None, the
+        handler shared by the session context is used.  See
+        :func:`yahoo_fantasy_api.yhandler.get_async_handler`.
+    :type handler: AsyncYHandler
+    :param cache_policy: TTLs and size limits of the league's caches
+    :type cache_policy: :class:`yahoo_fantasy_api.cache.LeagueCachePolicy`
+    """
+
+    def __init__(self, sc, league_id, handler=None, cache_policy=None):
+        super().__init__(sc, league_id,
+                         handler=handler if handler
+                         else yhandler.get_async_handler(sc),
+                         cache_policy=cache_policy)
+
+    def to_team(self, team_key):
+        """Construct an AsyncTeam object from a League
+
+        :param team_key: Team key of the new Team object to construct
+        :type team_key: str
+        :return: Fully constructed object
+        :rtype: AsyncTeam
+        """
+        return AsyncTeam(self.sc, team_key, handler=self.yhandler)
+
+    async def _settings_async(self):
+        if self.settings_snapshot is None:
+            self.settings_snapshot = league.LeagueSettings(
+                await self.yhandler.get_settings_raw(self.league_id))
+        return self.settings_snapshot
+
+    async def prefetch(self):
+        self._cache_stats_id_map((await self._settings_async()).game_code)
+
+    async def get_team(self, team_name):
+        return self._team_from_json(
+            await self.yhandler.get_league_teams_raw(self.league_id),
+            team_name)
+
+    async def _standings_async(self):
+        standings = self.standings_cache.get('S')
+        if standings is None:
+            standings = self.standings_cache['S'] = \
+                self._standings_from_json(
+                    await self.yhandler.get_standings_raw(self.league_id))
+        return standings
+
+    async def standings(self):
+        return (await self._standings_async())[0]
+
+    async def teams(self):
+        return (await self._standings_async())[1]
+
+    async def rosters(self, week=None, day=None):
+        return self._rosters_from_json(
+            await self.yhandler.get_league_rosters_raw(self.league_id,
+                                                       week=week, day=day))
+
+    async def pending_trades(self):
+        team_keys = list((await self.teams()).keys())
+        return self._pending_trades_from_json(
+            team_keys, await asyncio.gather(
+                *[self.yhandler.get_team_transactions(
+                    self.league_id, team_key, 'pending_trade')
+                  for team_key in team_keys]))
+
+    async def _scoreboard_async(self, week=None):
+        sb = self._cached_scoreboard(week)
+        if sb is None:
+            sb = self._store_scoreboard(week, league.Scoreboard(
+                await self.yhandler.get_scoreboard_raw(self.league_id, week)))
+        return sb
+
+    async def matchups(self, week=None):
+        return (await self._scoreboard_async(week)).json
+
+    async def settings(self):
+        return (await self._settings_async()).settings
+
+    async def stat_categories(self):
+        return (await self._settings_async()).stat_categories
+
+    async def edit_date(self):
+        return (await self._settings_async()).edit_date
+
+    async def positions(self):
+        return (await self._settings_async()).positions
+
+    async def team_key(self):
+        return self._team_key_from_json(await self.yhandler.get_teams_raw())
+
+    async def current_week(self):
+        return (await self._scoreboard_async()).current_week
+
+    async def end_week(self):
+        return (await self._scoreboard_async()).end_week
+
+    async def week_date_range(self, week):
+        current_week = await self.current_week()
+        if week <= current_week or week == 1:
+            return await self._date_range_of_played_or_current_week(week)
+        elif week == current_week + 1:
+            (cur_st, cur_end) = \
+                await self._date_range_of_played_or_current_week(week - 1)
+            req_st = cur_end + datetime.timedelta(days=1)
+            req_end = cur_end + datetime.timedelta(days=7)
+            return (req_st, req_end)
+        else:
+            raise RuntimeError("Cannot request date range more than one week "
+                               "past the current week.  The requested week is "
+                               "{}, but current week is {}.".format(
+                                   week, current_week))
+
+    async def _date_range_of_played_or_current_week(self, week):
+        date_range = self.week_date_range_cache.get(week)
+        if date_range is None:
+            date_range = self.week_date_range_cache[week] = \
+                self._date_range_from_scoreboard(
+                    await self._scoreboard_async(week))
+        return date_range
+
+    async def free_agents(self, position):
+        plyrs = self.free_agent_cache.get(position)
+        if plyrs is None:
+            plyrs = await self._fetch_players('FA', position=position)
+            self.free_agent_cache[position] = plyrs
+        return plyrs
+
+    async def waivers(self):
+        plyrs = self.waivers_cache.get('W')
+        if plyrs is None:
+            plyrs = self.waivers_cache['W'] = await self._fetch_players('W')
+        return plyrs
+
+    async def taken_players(self):
+        plyrs = self.taken_players_cache.get('T')
+        if plyrs is None:
+            plyrs = self.taken_players_cache['T'] = \
+                await self._fetch_players('T')
+        return plyrs
+
+    def iter_free_agents(self, position):
+        return self._iter_players('FA', position=position)
+
+    def iter_waivers(self):
+        return self._iter_players('W')
+
+    def iter_taken_players(self):
+        return self._iter_players('T')
+
+    async def _fetch_players(self, status, position=None):
+        return [p async for p in self._iter_players(status,
+                                                    position=position)]
+
+    async def _iter_players(self, status, position=None):
+        PLAYERS_PER_PAGE = 25
+        plyrIndex = 0
+        while plyrIndex % PLAYERS_PER_PAGE == 0:
+            j = await self.yhandler.get_players_raw(self.league_id, plyrIndex,
+                                                    status, position=position)
+            (num_plyrs_on_pg, fa_on_pg) = self._players_from_page(j)
+            if len(fa_on_pg) == 0:
+                break
+            for plyr in fa_on_pg:
+                yield plyr
+            plyrIndex += num_plyrs_on_pg
+
+    async def player_details(self, player):
+        if isinstance(player, int):
+            player = [player]
+        lookup = self._calc_lookup_for_player_detail(player)
+        fetched = {}
+        if isinstance(player, list):
+            pages = await asyncio.gather(
+                *[self.yhandler.get_player_raw(self.league_id, ids=ids)
+                  for ids in lookup])
+            for page in pages:
+                fetched.update(self._cache_player_details_from_json(page))
+        elif lookup is not None:
+            fetched.update(self._cache_player_details_from_json(
+                await self.yhandler.get_player_raw(self.league_id,
+                                                   search=lookup),
+                search=lookup))
+        return self._player_details_from_cache(player, fetched)
+
+    async def player_metadata(self, player_ids):
+        found = self._player_metadata_from_store(player_ids)
+        missing = [p for p in player_ids if p not in found]
+        for page in await asyncio.gather(
+                *[self.yhandler.get_player_raw(self.league_id, ids=ids,
+                                               stats=False)
+                  for ids in self._player_id_batches(missing)]):
+            found.update(self._player_metadata_from_json(page))
+        return [found[p] for p in player_ids]
+
+    async def percent_owned(self, player_ids):
+        po = {}
+        for page in await asyncio.gather(
+                *[self.yhandler.get_percent_owned_raw(self.league_id, ids)
+                  for ids in self._player_id_batches(player_ids)]):
+            po.update(self._percent_owned_from_json(page))
+        return po
+
+    async def ownership(self, player_ids):
+        ownership = {}
+        for page in await asyncio.gather(
+                *[self.yhandler.get_player_ownership_raw(self.league_id, ids)
+                  for ids in self._player_id_batches(player_ids)]):
+            ownership.update(self._ownership_from_json(page))
+        return ownership
+
+    async def player_stats(self, player_ids, req_type, date=None, week=None,
+                           season=None):
+        if not isinstance(player_ids, list):
+            player_ids = [player_ids]
+
+        self._cache_stats_id_map((await self._settings_async()).game_code)
+        pages = await asyncio.gather(
+            *[self.yhandler.get_player_stats_raw(
+                self.league_id, ids, req_type, date, week, season)
+              for ids in self._player_id_batches(player_ids)])
+        stats = []
+        for page in pages:
+            stats += self._plyr_stats_from_json(page)
+        return stats
+
+    async def draft_results(self):
+        return self._draft_results_from_json(
+            await self.yhandler.get_draftresults_raw(self.league_id))
+
+    async def transactions(self, tran_types, count):
+        return self._transactions_from_json(
+            await self.yhandler.get_transactions_raw(self.league_id,
+                                                     tran_types, count))
+
+    async def sync_transactions(self, cursor,
+                                tran_types='add,drop,commish,trade',
+                                page_size=25):
+        last_id = cursor.position(self.league_id, tran_types)
+        new = []
+        start = 0
+        while True:
+            page = self._transactions_from_json(
+                await self.yhandler.get_transactions_raw(
+                    self.league_id, tran_types, page_size, start=start))
+            (page_new, done) = self._new_transactions(page, last_id,
+                                                      page_size)
+            new += page_new
+            if done:
+                break
+            start += page_size
+        for transaction in reversed(new):
+            yield transaction
+            # The caller is back for more, so it is done with this one
+            cursor.advance(self.league_id, tran_types, transaction)
+
+
+class AsyncTeam(team.Team):
+    """Asynchronous version of :class:`yahoo_fantasy_api.team.Team`
+
+    The methods that call out to Yahoo! are coroutines.  They return the same
+    structures as the synchronous class.
+
+    :param sc: Fully constructed session context
+    :type sc: :class:`yahoo_oauth.OAuth2`
+    :param team_key: Team key identifier for the team we are constructing this
+        object for.
+    :type team_key: str
+    :param handler: Handler to send the requests through.  If None, the
+        handler shared by the session context is used.  See
+        :func:`yahoo_fantasy_api.yhandler.get_async_handler`.
+    :type handler: AsyncYHandler
+    """
+
+    def __init__(self, sc, team_key, handler=None):
+        super().__init__(sc, team_key,
+                         handler=handler if handler
+                         else yhandler.get_async_handler(sc))
+
+    async def details(self):
+        return self._details_from_json(
+            await self.yhandler.get_teams_by_keys_raw([self.team_key]))
+
+    async def matchup(self, week):
+        return self._matchup_from_json(
+            await self.yhandler.get_matchup_raw(self.team_key, week))
+
+    async def roster(self, week=None, day=None):
+        return self._roster_from_json(
+            await self.yhandler.get_roster_raw(self.team_key, week=week,
+                                               day=day))
+
+    async def proposed_trades(self):
+        return self._proposed_trades_from_json(
+            await self.yhandler.get_team_transactions(
+                self.league_id, self.team_key, "pending_trade"))
+
+    async def change_positions(self, time_frame, modified_lineup):
+        xml = self._construct_change_roster_xml(time_frame, modified_lineup)
+        await self.yhandler.put_roster(self.team_key, xml)
+
+    async def add_player(self, player_id):
+        xml = self._construct_transaction_xml("add", player_id)
+        await self.yhandler.post_transactions(self.league_id, xml)
+        self._invalidate_league_caches()
+
+    async def claim_player(self, player_id, faab=None):
+        xml = self._construct_transaction_xml("add", player_id, faab=faab)
+        await self.yhandler.post_transactions(self.league_id, xml)
+        self._invalidate_league_caches()
+
+    async def drop_player(self, player_id):
+        xml = self._construct_transaction_xml("drop", player_id)
+        await self.yhandler.post_transactions(self.league_id, xml)
+        self._invalidate_league_caches()
+
+    async def add_and_drop_players(self, add_player_id, drop_player_id):
+        xml = self._construct_transaction_xml("add/drop", add_player_id,
+                                              drop_player_id)
+        await self.yhandler.post_transactions(self.league_id, xml)
+        self._invalidate_league_caches()
+
+    async def claim_and_drop_players(self, add_player_id, drop_player_id,
+                                     faab=None):
+        xml = self._construct_transaction_xml(
+            "add/drop", add_player_id, drop_player_id, faab=faab
+        )
+        await self.yhandler.post_transactions(self.league_id, xml)
+        self._invalidate_league_caches()
+
+    async def reject_trade(self, transaction_key, trade_note=""):
+        xml = self._construct_trade_xml(transaction_key, "reject", trade_note)
+        await self.yhandler.put_transaction(transaction_key, xml)
+
+    async def accept_trade(self, transaction_key, trade_note=""):
+        xml = self._construct_trade_xml(transaction_key, "accept", trade_note)
+        await self.yhandler.put_transaction(transaction_key, xml)
+
+    async def propose_trade(self, tradee_team_key, players, trade_note=""):
+        xml = self._construct_trade_proposal_xml(tradee_team_key, players,
+                                                 trade_note)
+        await self.yhandler.post_transactions(self.league_id, xml)
+
+
+class AsyncDraftTracker(draft.DraftTracker):
+    """Asynchronous version of :class:`yahoo_fantasy_api.draft.DraftTracker`
+
+    :param lg: League to follow the draft of
+    :type lg: AsyncLeague
+    """
+
+    def __init__(self, lg, min_interval=2.0, max_interval=30.0,
+                 clock=time.monotonic, sleep=asyncio.sleep):
+        super().__init__(lg, min_interval=min_interval,
+                         max_interval=max_interval, clock=clock, sleep=sleep)
+
+    async def poll(self):
+        return self._update(
+            await self.lg.yhandler.get_draftresults_raw(self.lg.league_id))
+
+    async def follow(self):
+        while True:
+            for pick in await self.poll():
+                yield pick
+            if self.is_done():
+                return
+            await self.sleep(self.interval)
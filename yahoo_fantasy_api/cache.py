@@ -0,0 +1,573 @@
+#!/bin/python
+
+import collections
+import json
+import os
+import re
+import threading
+import time
+import weakref
+
+# TTL for responses that will never change (e.g. a week that has been played)
+IMMUTABLE = float('inf')
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+
+class CachePolicy:
+    """Decides which responses are cached and for how long
+
+    Responses are classified by the resource in their URI.  Only resources
+    with a TTL in the policy are cached.  A few are upgraded to
+    :data:`IMMUTABLE` based on the league metadata in the response itself:
+    anything from a league whose season is finished, the draft results once
+    the draft is done and the scoreboard of a week before the current week.
+
+    :param ttls: TTL in seconds for each resource.  Entries are merged with
+        DEFAULT_TTLS; use None to turn off caching for a resource.
+    :type ttls: dict(str, float)
+    """
+
+    DEFAULT_TTLS = {
+        'game': DAY,
+        'settings': HOUR,
+        'teams': HOUR,
+        'standings': 5 * MINUTE,
+        'draftresults': MINUTE,
+        'scoreboard': MINUTE,
+    }
+
+    # Patterns are compiled by re on first use rather than at import
+    RESOURCES = [
+        ('game', r'^game/[^/;]+$'),
+        ('settings', r'^league/[^/;]+/settings$'),
+        ('teams', r'^league/[^/;]+/teams$'),
+        ('standings', r'^league/[^/;]+/standings$'),
+        ('draftresults', r'^league/[^/;]+/draftresults$'),
+        ('scoreboard', r'^league/[^/;]+/scoreboard(;week=\d+)?$'),
+    ]
+
+    def __init__(self, ttls=None):
+        self.ttls = dict(self.DEFAULT_TTLS)
+        if ttls is not None:
+            self.ttls.update(ttls)
+
+    def resource(self, uri):
+        """Return the resource name of a URI or None if it is not known"""
+        for name, pat in self.RESOURCES:
+            if re.match(pat, uri):
+                return name
+        return None
+
+    def cacheable(self, uri):
+        """Return True if responses for this URI may be in the cache"""
+        return self.ttls.get(self.resource(uri)) is not None
+
+    def ttl(self, uri, doc):
+        """Return the TTL of a response or None if it shouldn't be cached
+
+        :param uri: URI the response was for
+        :type uri: str
+        :param doc: Decoded JSON document of the response
+        :type doc: dict
+        :rtype: float
+        """
+        resource = self.resource(uri)
+        ttl = self.ttls.get(resource)
+        if ttl is None:
+            return None
+        meta = self._league_meta(doc)
+        if str(meta.get('is_finished', '')) == '1':
+            return IMMUTABLE
+        if resource == 'draftresults' and \
+                meta.get('draft_status') == 'postdraft':
+            return IMMUTABLE
+        if resource == 'scoreboard' and ';week=' in uri:
+            week = int(uri[uri.rindex('=') + 1:])
+            if 'current_week' in meta and week < int(meta['current_week']):
+                return IMMUTABLE
+        return ttl
+
+    def _league_meta(self, doc):
+        try:
+            meta = doc['fantasy_content']['league'][0]
+        except (KeyError, IndexError, TypeError):
+            return {}
+        return meta if isinstance(meta, dict) else {}
+
+
+class MemoryCache:
+    """An in-process LRU cache of response bodies
+
+    :param max_bytes: Least recently used entries are evicted once the total
+        size of the bodies goes over this.
+    :type max_bytes: int
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, clock=time.time):
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.entries = collections.OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Return the body stored for the key, or None if missing or expired
+
+        :rtype: bytes
+        """
+        with self.lock:
+            if key not in self.entries:
+                return None
+            (body, expires) = self.entries[key]
+            if expires is not None and expires <= self.clock():
+                self._remove(key)
+                return None
+            self.entries.move_to_end(key)
+            return body
+
+    def set(self, key, body, ttl):
+        """Store a body for ttl seconds
+
+        :param key: Cache key, the login and the URI of the request
+        :type key: str
+        :param body: Raw response body
+        :type body: bytes
+        :param ttl: Seconds to keep the body.  IMMUTABLE keeps it until it is
+            evicted.
+        :type ttl: float
+        """
+        expires = None if ttl == IMMUTABLE else self.clock() + ttl
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (body, expires)
+            self.size += len(body)
+            while self.size > self.max_bytes and self.entries:
+                self._remove(next(iter(self.entries)))
+
+    def invalidate(self, key):
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def _remove(self, key):
+        (body, _) = self.entries.pop(key)
+        self.size -= len(body)
+
+
+class SQLiteCache:
+    """A persistent cache of response bodies kept in a SQLite file
+
+    The cache survives restarts and can be shared by processes on the same
+    host.  YHandler puts the identity of the Yahoo! login in the keys, so
+    processes using different logins don't see each other's responses.
+
+    :param path: Path of the SQLite database file.  It is created if missing.
+    :type path: str
+    :param max_bytes: Least recently used entries are evicted once the total
+        size of the bodies goes over this.
+    :type max_bytes: int
+    """
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, clock=time.time):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.lock = threading.Lock()
+        dirname = os.path.dirname(os.path.abspath(path))
+        os.makedirs(dirname, exist_ok=True)
+        import sqlite3
+        self.conn = sqlite3.connect(path, check_same_thread=False,
+                                    isolation_level=None)
+        self.conn.execute('''CREATE TABLE IF NOT EXISTS responses (
+                                 key TEXT PRIMARY KEY,
+                                 body BLOB NOT NULL,
+                                 size INTEGER NOT NULL,
+                                 expires REAL,
+                                 accessed REAL NOT NULL)''')
+        self.conn.execute('''CREATE INDEX IF NOT EXISTS responses_accessed
+                             ON responses (accessed)''')
+
+    def get(self, key):
+        """Return the body stored for the key, or None if missing or expired
+
+        :rtype: bytes
+        """
+        now = self.clock()
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT body, expires FROM responses WHERE key = ?',
+                (key,)).fetchone()
+            if row is None:
+                return None
+            (body, expires) = row
+            if expires is not None and expires <= now:
+                self.conn.execute('DELETE FROM responses WHERE key = ?',
+                                  (key,))
+                return None
+            self.conn.execute(
+                'UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+            return bytes(body)
+
+    def set(self, key, body, ttl):
+        """Store a body for ttl seconds
+
+        :param key: Cache key, the login and the URI of the request
+        :type key: str
+        :param body: Raw response body
+        :type body: bytes
+        :param ttl: Seconds to keep the body.  IMMUTABLE keeps it until it is
+            evicted.
+        :type ttl: float
+        """
+        now = self.clock()
+        expires = None if ttl == IMMUTABLE else now + ttl
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+                (key, memoryview(body), len(body), expires, now))
+            self._evict()
+
+    def invalidate(self, key):
+        with self.lock:
+            self.conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute('DELETE FROM responses')
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def _evict(self):
+        (total,) = self.conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()
+        if total <= self.max_bytes:
+            return
+        self.conn.execute('DELETE FROM responses WHERE expires <= ?',
+                          (self.clock(),))
+        rows = self.conn.execute(
+            'SELECT key, size FROM responses ORDER BY accessed').fetchall()
+        (total,) = self.conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()
+        for (key, size) in rows:
+            if total <= self.max_bytes:
+                break
+            self.conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            total -= size
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """A dict-like in-memory cache of parsed results
+
+    Entries expire ttl seconds after they are stored.  Least recently used
+    entries are evicted once there are more than max_entries of them or
+    their estimated size goes over max_bytes.
+
+    :param ttl: Seconds to keep an entry.  IMMUTABLE keeps it until it is
+        evicted.
+    :type ttl: float
+    :param max_entries: Most entries to keep.  None for no limit.
+    :type max_entries: int
+    :param max_bytes: Most bytes to keep, estimated from the JSON encoding of
+        the entries.  None for no limit.
+    :type max_bytes: int
+    """
+
+    def __init__(self, ttl=IMMUTABLE, max_entries=None, max_bytes=None,
+                 clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.entries = collections.OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        with self.lock:
+            self._expire()
+            return len(self.entries)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        expires = None if self.ttl == IMMUTABLE else self.clock() + self.ttl
+        size = 0
+        if self.max_bytes is not None:
+            size = len(json.dumps(value, default=str))
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (value, expires, size)
+            self.size += size
+            if self._full():
+                # Drop the expired entries before evicting live ones
+                self._expire()
+            while self.entries and self._full():
+                self._remove(next(iter(self.entries)))
+
+    def get(self, key, default=None):
+        """Return the value of a key or default if missing or expired"""
+        with self.lock:
+            if key not in self.entries:
+                return default
+            (value, expires, _) = self.entries[key]
+            if expires is not None and expires <= self.clock():
+                self._remove(key)
+                return default
+            self.entries.move_to_end(key)
+            return value
+
+    def keys(self):
+        with self.lock:
+            self._expire()
+            return list(self.entries.keys())
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def _full(self):
+        return (self.max_entries is not None and
+                len(self.entries) > self.max_entries) or \
+            (self.max_bytes is not None and self.size > self.max_bytes)
+
+    def _expire(self):
+        now = self.clock()
+        for key in [k for k, (_, expires, _) in self.entries.items()
+                    if expires is not None and expires <= now]:
+            self._remove(key)
+
+    def _remove(self, key):
+        (_, _, size) = self.entries.pop(key)
+        self.size -= size
+
+
+class LeagueCachePolicy:
+    """TTLs and size limits of the caches that a League keeps
+
+    One policy can be shared by many League objects.  Invalidating a kind
+    through the policy clears it in all of them.
+
+    :param ttls: TTL in seconds for each kind of cache.  Entries are merged
+        with DEFAULT_TTLS.
+    :type ttls: dict(str, float)
+    :param max_entries: Most entries in each cache.  Defaults to
+        DEFAULT_MAX_ENTRIES.  None for no limit.
+    :type max_entries: int
+    :param max_bytes: Most estimated bytes in each cache.  None for no limit.
+    :type max_bytes: int
+    """
+
+    # Most entries in each cache unless the policy says otherwise.  Enough
+    # for the details of every player in a game.
+    DEFAULT_MAX_ENTRIES = 4096
+
+    DEFAULT_TTLS = {
+        'free_agents': 5 * MINUTE,
+        'waivers': 5 * MINUTE,
+        'taken_players': 5 * MINUTE,
+        'standings': 5 * MINUTE,
+        'player_details': HOUR,
+        'week_date_range': IMMUTABLE,
+    }
+
+    def __init__(self, ttls=None, max_entries=_MISSING, max_bytes=None):
+        self.ttls = dict(self.DEFAULT_TTLS)
+        if ttls is not None:
+            self._check_kinds(ttls)
+            self.ttls.update(ttls)
+        self.max_entries = self.DEFAULT_MAX_ENTRIES \
+            if max_entries is _MISSING else max_entries
+        self.max_bytes = max_bytes
+        self.caches = {kind: weakref.WeakSet() for kind in self.ttls}
+        self.lock = threading.Lock()
+
+    def new_cache(self, kind):
+        """Return a new cache of the given kind that follows this policy
+
+        :rtype: TTLCache
+        """
+        self._check_kinds([kind])
+        c = TTLCache(ttl=self.ttls[kind], max_entries=self.max_entries,
+                     max_bytes=self.max_bytes)
+        with self.lock:
+            self.caches[kind].add(c)
+        return c
+
+    def invalidate(self, kind=None):
+        """Clear the caches of one kind, or all of them if kind is None"""
+        if kind is not None:
+            self._check_kinds([kind])
+        with self.lock:
+            caches = [c for k, cs in self.caches.items()
+                      if kind is None or k == kind for c in cs]
+        for c in caches:
+            c.clear()
+
+    def _check_kinds(self, kinds):
+        for kind in kinds:
+            if kind not in self.DEFAULT_TTLS:
+                raise ValueError("Unknown cache kind {}.  Valid kinds are: "
+                                 "{}".format(kind,
+                                             ", ".join(self.DEFAULT_TTLS)))
+
+
+# The kinds of League caches that go stale when a team adds or drops a player
+ROSTER_MOVE_KINDS = ('free_agents', 'waivers', 'taken_players')
+
+# League objects in the process by league ID.  This lets a roster move made
+# through a Team invalidate the caches of the leagues it is in.  League IDs
+# whose objects are all gone are pruned once the registry doubles in size.
+_leagues = collections.defaultdict(weakref.WeakSet)
+_leagues_lock = threading.Lock()
+_LEAGUES_MIN_PRUNE = 64
+_leagues_prune_at = _LEAGUES_MIN_PRUNE
+
+
+def register_league(league_id, lg):
+    """Register a League so that invalidate_league() reaches it"""
+    global _leagues_prune_at
+    with _leagues_lock:
+        _leagues[league_id].add(lg)
+        if len(_leagues) >= _leagues_prune_at:
+            for gone in [k for k, lgs in _leagues.items() if not lgs]:
+                del _leagues[gone]
+            _leagues_prune_at = max(_LEAGUES_MIN_PRUNE, 2 * len(_leagues))
+
+
+def invalidate_league(league_id, kinds=None):
+    """Invalidate caches of every League for league_id in this process
+
+    :param league_id: League ID, e.g. 396.l.21484
+    :type league_id: str
+    :param kinds: Kinds of caches to invalidate.  None for all of them.
+    :type kinds: list(str)
+    """
+    with _leagues_lock:
+        lgs = list(_leagues.get(league_id, []))
+        if not lgs:
+            _leagues.pop(league_id, None)
+    for lg in lgs:
+        for kind in kinds if kinds is not None else [None]:
+            lg.invalidate(kind)
+
+
+class PlayerStore:
+    """A process-wide LRU store of player metadata
+
+    Player metadata (name, team, positions, headshot, etc.) is the same in
+    every league of a game, so it is shared by all of the League and Team
+    objects in the process.  Entries are keyed by game ID and player ID.
+
+    :param max_entries: Most players to keep.  Least recently used players
+        are evicted past it.  The store is capped by count rather than bytes
+        because measuring each player costs more than parsing it.  The
+        JSON of a player's metadata is around 1 KB.
+    :type max_entries: int
+    """
+
+    # Fields of the player data that differ between leagues
+    LEAGUE_FIELDS = frozenset(['is_keeper'])
+
+    def __init__(self, max_entries=8192):
+        self.max_entries = max_entries
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, game_id, player_id):
+        """Return the metadata of a player or None if it isn't stored
+
+        :param game_id: Game ID of the player (e.g. 396)
+        :type game_id: str
+        :param player_id: Player ID
+        :type player_id: int
+        :rtype: dict
+        """
+        key = (str(game_id), int(player_id))
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+            if isinstance(entry, list):
+                # First read since the player data was added
+                entry = self.entries[key] = self.metadata(entry)
+            return entry
+
+    def add(self, game_id, player_data):
+        """Store the player data of a Yahoo! response
+
+        This is called for every player parsed, so it only keeps a reference
+        to the player data.  It is merged into a metadata dict the first
+        time it is read with get().
+
+        :param game_id: Game ID of the player (e.g. 396)
+        :type game_id: str
+        :param player_data: The first element of a 'player' list.  This is a
+            list of single field dicts.
+        :type player_data: list
+        :return: Player ID of the player, or None if the data has none
+        :rtype: int
+        """
+        player_id = None
+        for ele in player_data:
+            if isinstance(ele, dict) and 'player_id' in ele:
+                player_id = int(ele['player_id'])
+                break
+        if player_id is None:
+            return None
+        key = (str(game_id), player_id)
+        with self.lock:
+            self.entries[key] = player_data
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return player_id
+
+    def metadata(self, player_data):
+        """Merge the player data of a Yahoo! response into a metadata dict
+
+        :param player_data: The first element of a 'player' list
+        :type player_data: list
+        :rtype: dict
+        """
+        meta = {}
+        for ele in player_data:
+            if isinstance(ele, dict):
+                for k, v in ele.items():
+                    if k not in self.LEAGUE_FIELDS:
+                        meta[k] = v
+        return meta
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+# Player store shared by every League and Team in the process
+PLAYER_STORE = PlayerStore()
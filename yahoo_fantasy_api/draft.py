@@ -0,0 +1,135 @@
+#!/bin/python
+
+import time
+
+from yahoo_fantasy_api import extract
+
+
+class DraftTracker:
+    """Follows a live draft and reports only the picks made since last time
+
+    Yahoo! returns a slot for every pick of the draft; the ones not made yet
+    have no player.  The tracker remembers the first slot that is still
+    empty, so each poll only walks the slots from there on instead of the
+    whole board.  If the handler revalidates the draft results with a
+    conditional GET, the unchanged board isn't walked at all.  The picks are
+    kept in an in-memory board indexed by round, team and player.
+
+    The time to wait between polls adapts to the pace of the draft.  It is
+    half of the average time between picks, kept between min_interval and
+    max_interval, and it backs off while no picks are being made.
+
+    :param lg: League to follow the draft of
+    :type lg: :class:`yahoo_fantasy_api.league.League`
+    :param min_interval: Shortest time in seconds between polls
+    :type min_interval: float
+    :param max_interval: Longest time in seconds between polls
+    :type max_interval: float
+
+    >>> tracker = DraftTracker(lg)
+    >>> for pick in tracker.follow():
+    ...     print(pick['round'], pick['team_key'], pick['player_id'])
+    """
+
+    # Factor the interval grows by after a poll without new picks
+    BACKOFF = 1.5
+
+    def __init__(self, lg, min_interval=2.0, max_interval=30.0,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.lg = lg
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.clock = clock
+        self.sleep = sleep
+        self.picks = []
+        self.by_round = {}
+        self.by_team = {}
+        self.by_player = {}
+        self.draft_status = None
+        self.interval = min_interval
+        self.pace = None
+        self.last_pick_time = None
+        self._seen = set()
+        self._first_open = 0
+        self._last_json = None
+
+    def poll(self):
+        """Fetch the draft results and return the picks made since last poll
+
+        :return: New picks, in pick order.  Each is in the same form as
+            :meth:`yahoo_fantasy_api.league.League.draft_results`.
+        :rtype: list(dict)
+        """
+        return self._update(
+            self.lg.yhandler.get_draftresults_raw(self.lg.league_id))
+
+    def is_done(self):
+        """Return True once the draft is over"""
+        return self.draft_status == 'postdraft'
+
+    def follow(self):
+        """Generate each pick as it is made until the draft is over
+
+        Picks already made when this is called are generated first.
+        """
+        while True:
+            for pick in self.poll():
+                yield pick
+            if self.is_done():
+                return
+            self.sleep(self.interval)
+
+    def _update(self, json):
+        if json is self._last_json:
+            # The handler revalidated the board from the last poll, so there
+            # is nothing new in it.
+            self._adapt_interval(0)
+            return []
+        self._last_json = json
+        lg = json['fantasy_content']['league']
+        self.draft_status = lg[0].get('draft_status')
+        slots = lg[1].get('draft_results') or {}
+        num_slots = int(slots['count']) if 'count' in slots else 0
+
+        new = []
+        first_open = None
+        for i in range(self._first_open, num_slots):
+            if i in self._seen:
+                continue
+            result = slots[str(i)]['draft_result']
+            if 'player_key' not in result:
+                if first_open is None:
+                    first_open = i
+                continue
+            new.append(self._add_pick(i, result))
+        self._first_open = num_slots if first_open is None else first_open
+        self._adapt_interval(len(new))
+        return new
+
+    def _add_pick(self, i, result):
+        pick = {k: v for k, v in result.items() if k != 'player_key'}
+        pick['player_id'] = extract.player_id(result['player_key'])
+        self._seen.add(i)
+        self.picks.append(pick)
+        self.by_round.setdefault(pick['round'], []).append(pick)
+        self.by_team.setdefault(pick['team_key'], []).append(pick)
+        self.by_player[pick['player_id']] = pick
+        return pick
+
+    def _adapt_interval(self, num_new):
+        now = self.clock()
+        if self.is_done() or self.draft_status == 'predraft':
+            self.interval = self.max_interval
+        elif num_new == 0:
+            self.interval = min(self.max_interval,
+                                self.interval * self.BACKOFF)
+        else:
+            if self.last_pick_time is not None:
+                gap = (now - self.last_pick_time) / num_new
+                self.pace = gap if self.pace is None \
+                    else (self.pace + gap) / 2
+                self.interval = max(self.min_interval,
+                                    min(self.max_interval, self.pace / 2))
+            else:
+                self.interval = self.min_interval
+            self.last_pick_time = now
@@ -0,0 +1,114 @@
+#!/bin/python
+
+"""Accessors for the JSON documents returned by the Yahoo! Fantasy APIs
+
+Yahoo! encodes its XML resources in JSON with a few recurring shapes:
+
+* A collection is a dict keyed '0', '1', ... with a 'count' entry, or an
+  empty list when there is nothing in it.  Each entry is a dict with a single
+  key naming the resource, e.g. {'team': [...]}.
+* A resource is a list.  The first element holds its own fields, either as a
+  dict or as a list of single key dicts padded with empty lists.  The
+  elements after it hold the sub-resources, e.g. {'roster': {...}}.
+
+The functions here walk those shapes directly, so each parser reads only the
+parts of the document it needs instead of searching all of it.
+"""
+
+import operator
+
+
+def path(*keys):
+    """Return an accessor for a fixed location in a document
+
+    >>> league_meta = path('fantasy_content', 'league', 0)
+    >>> league_meta(json)['current_week']
+    12
+    """
+    if len(keys) == 1:
+        return operator.itemgetter(keys[0])
+
+    def get(doc):
+        for key in keys:
+            doc = doc[key]
+        return doc
+    return get
+
+
+def collection(coll, name):
+    """Generate the entries of a collection
+
+    :param coll: The collection.  An empty list or None is an empty
+        collection.
+    :param name: Name of the resource held in the collection, e.g. 'team'
+    :type name: str
+    """
+    if not coll:
+        return
+    for i in range(int(coll['count'])):
+        yield coll[str(i)][name]
+
+
+def merge(elements):
+    """Merge a list of dicts into one dict, skipping the padding
+
+    :param elements: List of dicts, e.g. the fields of a team
+    :type elements: list
+    :rtype: dict
+    """
+    merged = {}
+    for ele in elements:
+        if isinstance(ele, dict):
+            merged.update(ele)
+    return merged
+
+
+def fields(resource):
+    """Return the fields of a resource as one dict
+
+    :param resource: A resource list.  A resource that Yahoo! sent as a
+        plain dict is returned as is.
+    :rtype: dict
+    """
+    if isinstance(resource, dict):
+        return resource
+    first = resource[0] if resource else {}
+    if isinstance(first, dict):
+        return first
+    return merge(first)
+
+
+def sub(resource, name, default=None):
+    """Return a sub-resource of a resource
+
+    :param resource: A resource list
+    :type resource: list
+    :param name: Name of the sub-resource, e.g. 'players'
+    :type name: str
+    :return: The sub-resource or default if the resource doesn't have it
+    """
+    if isinstance(resource, list):
+        for ele in resource[1:]:
+            if isinstance(ele, dict) and name in ele:
+                return ele[name]
+    return default
+
+
+def player_id(player_key):
+    """Return the player ID of a player key such as '396.p.5425'
+
+    :rtype: int
+    """
+    return int(player_key[player_key.rindex('.p.') + 3:])
+
+
+fantasy_content = path('fantasy_content')
+league = path('fantasy_content', 'league')
+users = path('fantasy_content', 'users')
+
+
+def user_games(json):
+    """Generate the games of the logged in user of a users;use_login=1 doc"""
+    for user in collection(users(json), 'user'):
+        for game in collection(sub(user, 'games'), 'game'):
+            yield game
@@ -1,7 +1,6 @@
 #!/bin/python
 
-from yahoo_fantasy_api import yhandler, league
-import objectpath
+from yahoo_fantasy_api import extract, yhandler, league
 
 
 class Game:
@@ -11,12 +10,22 @@ class Game:
     :type sc: :class:`yahoo_oauth.OAuth2`
     :param code: Sport code (mlb, nhl, etc)
     :type code: str
+    :param handler: Handler to send the requests through.  If None, the
+        handler shared by the session context is used.  See
+        :func:`yahoo_fantasy_api.yhandler.get_handler`.
+    :type handler: YHandler
     """
 
-    def __init__(self, sc, code):
+    # Most leagues the leagues collection API takes in one request
+    LEAGUES_PER_REQUEST = 25
+
+    def __init__(self, sc, code, handler=None):
         self.sc = sc
         self.code = code
-        self.yhandler = yhandler.YHandler(sc)
+        if handler:
+            self.yhandler = handler
+        else:
+            self.yhandler = yhandler.get_handler(sc)
 
     def inject_yhandler(self, yhandler):
         self.yhandler = yhandler
@@ -26,12 +35,11 @@ class Game:
         :return: Game ID
         :rtype: str
         """
-        t = objectpath.Tree(self.yhandler.get_game_raw(self.code))
-        jfilter = t.execute('$..(game_id)')
-        id = ''
-        for row in jfilter:
-            id = row['game_id']
-        return id
+        return self._game_id_from_json(self.yhandler.get_game_raw(self.code))
+
+    def _game_id_from_json(self, json):
+        return extract.fields(
+            extract.fantasy_content(json)['game']).get('game_id', '')
 
     def to_league(self, league_id):
         """Construct a League object from a Game
@@ -44,6 +52,59 @@ class Game:
         lg = league.League(self.sc, league_id, handler=self.yhandler)
         return lg
 
+    def leagues_bulk(self, league_ids,
+                     resources=('settings', 'standings', 'scoreboard')):
+        """Construct League objects for many leagues with a few requests
+
+        The leagues are fetched with the leagues collection API, up to
+        LEAGUES_PER_REQUEST leagues per request.  The resources asked for are
+        loaded into each League, so calls like settings(), standings() or
+        current_week() don't go back to Yahoo!.
+
+        :param league_ids: League IDs to fetch
+        :type league_ids: list[str]
+        :param resources: League resources to load.  Any of settings,
+            standings and scoreboard.
+        :type resources: list[str]
+        :return: The League objects keyed by league ID
+        :rtype: dict
+
+        >>> lgs = gm.leagues_bulk(gm.league_ids())
+        >>> lgs['388.l.27081'].standings()[0]['name']
+        'Lumber Kings'
+        """
+        self._check_bulk_resources(resources)
+        leagues = {}
+        for i in range(0, len(league_ids), self.LEAGUES_PER_REQUEST):
+            leagues.update(self._leagues_from_bulk_json(
+                self.yhandler.get_leagues_by_keys_raw(
+                    league_ids[i:i + self.LEAGUES_PER_REQUEST], resources)))
+        return leagues
+
+    def _check_bulk_resources(self, resources):
+        supported = league.League.BULK_RESOURCES
+        for r in resources:
+            if r not in supported:
+                raise ValueError("Cannot load {} in bulk.  Supported "
+                                 "resources are: {}".format(
+                                     r, ", ".join(supported)))
+
+    def _leagues_from_bulk_json(self, json):
+        lgs = json['fantasy_content']['leagues']
+        leagues = {}
+        for i in range(int(lgs['count'])):
+            entry = lgs[str(i)]['league']
+            meta = entry[0]
+            lg = self.to_league(meta['league_key'])
+            # Each sub-resource is loaded from a document shaped like the
+            # response of its single league API.
+            for sub in entry[1:]:
+                for resource, value in sub.items():
+                    lg._load(resource, {'fantasy_content': {
+                        'league': [meta, {resource: value}]}})
+            leagues[lg.league_id] = lg
+        return leagues
+
     def league_ids(self, year=None, is_available=False, game_types=None, game_codes=None, seasons=None):
         """Return the Yahoo! league IDs that the current user played in
 
@@ -62,13 +123,19 @@ class Game:
         if year is not None:
             return self._league_ids_deprecated(year=year)
 
-        t = objectpath.Tree(
+        return self._league_ids_from_json(
             self.yhandler.get_leagues_raw(
                 is_available=is_available,
                 game_types=game_types,
                 game_codes=game_codes,
                 seasons=seasons))
-        ids = list(t.execute('$..league_key'))
+
+    def _league_ids_from_json(self, json):
+        ids = []
+        for game in extract.user_games(json):
+            for lg in extract.collection(extract.sub(game, 'leagues'),
+                                         'league'):
+                ids.append(extract.fields(lg)['league_key'])
         return ids
 
     def _league_ids_deprecated(self, year=None):
@@ -78,22 +145,21 @@ class Game:
         :type year: int
         :returns: List of league ids
         """
-        t = objectpath.Tree(self.yhandler.get_teams_raw())
-        jfilter = t.execute('$..(team_key,season,code)')
-        league_applies = False
+        return self._league_ids_from_teams_json(self.yhandler.get_teams_raw(),
+                                                year=year)
+
+    def _league_ids_from_teams_json(self, json, year=None):
         ids = []
-        for row in jfilter:
-            # We'll see two types of rows that come out of objectpath filter.
-            # A row that has the season/code, then all of the leagues that it
-            # applies too.  Check if the subsequent league applies each time we
-            # get the season/code pair.
-            if 'season' in row and 'code' in row:
-                league_applies = row['code'] == self.code
-                if league_applies is True and year is not None:
-                    league_applies = int(row['season']) == int(year)
-            elif league_applies:
-                assert('team_key' in row)
-                ids.append(self._extract_id_from_team_key(row['team_key']))
+        for game in extract.user_games(json):
+            meta = extract.fields(game)
+            if meta['code'] != self.code:
+                continue
+            if year is not None and int(meta['season']) != int(year):
+                continue
+            for team in extract.collection(extract.sub(game, 'teams'),
+                                           'team'):
+                ids.append(self._extract_id_from_team_key(
+                    extract.fields(team)['team_key']))
         # Return leagues in deterministic order
         ids.sort()
         return ids
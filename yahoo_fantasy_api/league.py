@@ -1,48 +1,293 @@
 #!/bin/python
 
 import yahoo_fantasy_api as yfa
-from yahoo_fantasy_api import yhandler
-import objectpath
+from yahoo_fantasy_api import cache, extract, yhandler
+import collections
 import datetime
-import re
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LeagueSettings:
+    """A snapshot of the league settings
+
+    The settings document is fetched once per league and parsed in a single
+    pass.  All of the settings based accessors in :class:`League` read from
+    this object.
+
+    :param json: JSON document returned from the settings API
+    :type json: dict
+    """
+
+    def __init__(self, json):
+        self.settings = {}
+        self.stat_categories = []
+        self.stat_names = {}
+        self.positions = {}
+        self.edit_date = None
+        self.game_code = None
+        if "fantasy_content" in json:
+            content = json["fantasy_content"]
+            if "league" in content:
+                self._parse(content["league"])
+
+    def _parse(self, lg):
+        meta = lg[0]
+        lg_settings = lg[1]["settings"][0]
+        self.settings.update(meta)
+        # Filtering out 'roster_positions' and 'stat_categories' from the
+        # settings dict because they are parsed into their own fields.
+        for k, v in lg_settings.items():
+            if k not in ["roster_positions", "stat_categories"]:
+                self.settings[k] = v
+        self.game_code = meta.get('game_code')
+        if 'edit_key' in meta:
+            self.edit_date = datetime.datetime.strptime(
+                meta['edit_key'], '%Y-%m-%d').date()
+
+        for s in lg_settings.get("stat_categories", {}).get("stats", []):
+            stat = s["stat"]
+            self.stat_names[int(stat["stat_id"])] = stat["display_name"]
+            # Omit stats that are only for display purposes
+            if 'is_only_display_stat' not in stat:
+                self.stat_categories.append(
+                    {"display_name": stat["display_name"],
+                     "position_type": stat["position_type"]})
+
+        for p in lg_settings.get("roster_positions", []):
+            rp = p["roster_position"]
+            pos = {}
+            for k, v in rp.items():
+                if k == 'position':
+                    continue
+                if k == 'count':
+                    v = int(v)
+                pos[k] = v
+            self.positions[rp['position']] = pos
+
+
+class Scoreboard:
+    """A snapshot of the scoreboard of one week
+
+    The scoreboard is parsed once into the fields that :class:`League` needs.
+    The raw document is kept for :meth:`League.matchups`.
+
+    :param json: JSON document returned from the scoreboard API
+    :type json: dict
+    """
+
+    def __init__(self, json):
+        self.json = json
+        self.fetched = time.monotonic()
+        lg = json['fantasy_content']['league']
+        self.current_week = int(lg[0]['current_week'])
+        self.end_week = int(lg[0]['end_week'])
+        scoreboard = lg[1]['scoreboard']
+        self.week = int(scoreboard['week'])
+        self.date_range = None
+        matchups = scoreboard.get('0', {}).get('matchups', {})
+        if '0' in matchups:
+            matchup = matchups['0']['matchup']
+            self.date_range = (
+                datetime.datetime.strptime(matchup['week_start'],
+                                           "%Y-%m-%d").date(),
+                datetime.datetime.strptime(matchup['week_end'],
+                                           "%Y-%m-%d").date())
+
+    def is_final(self):
+        """Return True if the week is over, so the scoreboard won't change"""
+        return self.week < self.current_week
+
+    def is_stale(self, ttl):
+        """Return True if the scoreboard is older than ttl seconds
+
+        Scoreboards of weeks that are over never go stale.
+        """
+        return not self.is_final() and time.monotonic() - self.fetched > ttl
+
+
+class TransactionCursor:
+    """Remembers the last transaction synced for each league
+
+    Used with :meth:`League.sync_transactions` so that only new transactions
+    are fetched.  One cursor can track many leagues.  It can be saved to a
+    file and loaded back so a restarted process picks up where it stopped.
+
+    :param positions: Positions to start from, as returned by to_dict()
+    :type positions: dict
+    """
+
+    def __init__(self, positions=None):
+        self.positions = dict(positions) if positions else {}
+        self.lock = threading.Lock()
+
+    def position(self, league_id, tran_types):
+        """Return the last transaction ID synced, or None if none were
+
+        :rtype: int
+        """
+        with self.lock:
+            pos = self.positions.get(self._key(league_id, tran_types))
+        return None if pos is None else pos['transaction_id']
+
+    def advance(self, league_id, tran_types, transaction):
+        """Move the cursor of a league past the given transaction"""
+        pos = {'transaction_id': int(transaction['transaction_id'])}
+        with self.lock:
+            self.positions[self._key(league_id, tran_types)] = pos
+
+    def to_dict(self):
+        with self.lock:
+            return {k: dict(v) for k, v in self.positions.items()}
+
+    def save(self, path):
+        """Write the cursor to a JSON file
+
+        The file is replaced in one step so a crash never leaves half of it.
+        """
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read a cursor that was written by save()
+
+        An empty cursor is returned if the file doesn't exist.
+
+        :rtype: TransactionCursor
+        """
+        try:
+            with open(path, 'r') as f:
+                return cls(json.load(f))
+        except FileNotFoundError:
+            return cls()
+
+    def _key(self, league_id, tran_types):
+        # Transaction IDs are shared by all types, so a cursor is only
+        # valid for the types it was synced with.
+        return "{};types={}".format(league_id, tran_types)
 
 
 class League:
     """An abstraction for all of the league-level APIs in Yahoo! fantasy
 
+    Construction does not call out to Yahoo!.  The league settings are
+    fetched on first use or by calling :meth:`prefetch`.
+
     :param sc: Fully constructed session context
     :type sc: :class:`yahoo_oauth.OAuth2`
     :param league_id: League ID to setup this class for.  All API requests
         will be for this league.
     :type league_id: str
+    :param max_workers: Maximum number of requests to have in flight when an
+        API needs several pages from Yahoo!.  The default of 1 fetches the
+        pages one after another.
+    :type max_workers: int
+    :param cache_policy: TTLs and size limits of the free agent, waiver,
+        taken player, player detail and week date range caches.  If None,
+        the defaults of :class:`yahoo_fantasy_api.cache.LeagueCachePolicy`
+        are used.
+    :type cache_policy: :class:`yahoo_fantasy_api.cache.LeagueCachePolicy`
     """
 
-    def __init__(self, sc, league_id, handler=None):
+    # Fields of the player data that _players_from_page returns
+    PAGE_PLAYER_KEYS = frozenset(['name', 'player_id', 'position_type',
+                                  'status', 'eligible_positions'])
+
+    # Seconds a scoreboard of the current week is reused before refetching
+    SCOREBOARD_TTL = 60
+
+    # League resources that can be loaded in bulk with Game.leagues_bulk
+    BULK_RESOURCES = ('settings', 'standings', 'scoreboard')
+
+    def __init__(self, sc, league_id, handler=None, max_workers=1,
+                 cache_policy=None):
         self.sc = sc
         self.league_id = league_id
+        self.max_workers = max_workers
         if handler:
             self.yhandler = handler
         else:
-            self.yhandler = yhandler.YHandler(sc)
-        self.current_week_cache = None
-        self.end_week_cache = None
-        self.week_date_range_cache = {}
-        self.free_agent_cache = {}
-        self.waivers_cache = None
-        self.taken_players_cache = None
-        self.stat_categories_cache = None
-        self.settings_cache = None
-        self.edit_date_cache = None
-        self.positions_cache = None
+            self.yhandler = yhandler.get_handler(sc)
+        self.scoreboard_cache = {}
+        self.cache_policy = cache_policy if cache_policy is not None \
+            else cache.LeagueCachePolicy()
+        self.standings_cache = self.cache_policy.new_cache('standings')
+        self.week_date_range_cache = \
+            self.cache_policy.new_cache('week_date_range')
+        self.free_agent_cache = self.cache_policy.new_cache('free_agents')
+        self.waivers_cache = self.cache_policy.new_cache('waivers')
+        self.taken_players_cache = \
+            self.cache_policy.new_cache('taken_players')
+        self.settings_snapshot = None
         self.stats_id_map = None
-        self.player_details_cache = {}
-        lg_settings = self.settings()
-        game_code = lg_settings['game_code']
-        self._cache_stats_id_map(game_code)
+        self.player_details_cache = \
+            self.cache_policy.new_cache('player_details')
+        self.player_store = cache.PLAYER_STORE
+        cache.register_league(league_id, self)
 
     def inject_yhandler(self, yhandler):
         self.yhandler = yhandler
 
+    def invalidate(self, kind=None):
+        """Clear one kind of cache of this league, or all of them
+
+        This is done automatically for free_agents, waivers and
+        taken_players when a Team of this league adds or drops a player.
+
+        :param kind: One of free_agents, waivers, taken_players, standings,
+            player_details or week_date_range.  None clears all of them.
+        :type kind: str
+
+        >>> lg.invalidate('free_agents')
+        """
+        caches = {'free_agents': self.free_agent_cache,
+                  'waivers': self.waivers_cache,
+                  'taken_players': self.taken_players_cache,
+                  'standings': self.standings_cache,
+                  'player_details': self.player_details_cache,
+                  'week_date_range': self.week_date_range_cache}
+        if kind is not None and kind not in caches:
+            raise ValueError("Unknown cache kind {}.  Valid kinds are: "
+                             "{}".format(kind, ", ".join(caches)))
+        for k, c in caches.items():
+            if kind is None or k == kind:
+                c.clear()
+
+    def prefetch(self):
+        """Load the league settings and the stat ID map
+
+        Constructing a League does no network I/O; the settings are loaded
+        on first use.  Call this to warm them up front.
+
+        >>> lg = gm.to_league('396.l.21484')
+        >>> lg.prefetch()
+        """
+        self._cache_stats_id_map(self._settings().game_code)
+
+    def _load(self, resource, json):
+        """Seed a snapshot with a document fetched elsewhere
+
+        Used by :meth:`yahoo_fantasy_api.game.Game.leagues_bulk` so that a
+        league fetched in a batch doesn't fetch the same data again.
+
+        :param resource: One of BULK_RESOURCES
+        :type resource: str
+        :param json: Document in the same form as the league API returns
+        :type json: dict
+        """
+        if resource == 'settings':
+            self.settings_snapshot = LeagueSettings(json)
+        elif resource == 'standings':
+            self.standings_cache['S'] = self._standings_from_json(json)
+        elif resource == 'scoreboard':
+            self._store_scoreboard(None, Scoreboard(json))
+
     def to_team(self, team_key):
         """Construct a Team object from a League
 
@@ -64,13 +309,16 @@ class League:
         :rtype: dict
         """
         json = self.yhandler.get_league_teams_raw(self.league_id)
-        t = objectpath.Tree(json)
+        return self._team_from_json(json, team_name)
+
+    def _team_from_json(self, json, team_name):
         team = {}
-        try:
-            team_key = t.execute("$..teams..team[@[2].name is '{}']..team_key[0]".format(team_name))
-            team[team_name] = self.to_team(team_key)
-        except StopIteration:
-            pass
+        for tm in extract.collection(extract.league(json)[1]['teams'],
+                                     'team'):
+            meta = extract.fields(tm)
+            if meta.get('name') == team_name:
+                team[team_name] = self.to_team(meta['team_key'])
+                break
         return team
 
     def standings(self):
@@ -94,21 +342,7 @@ class League:
           'percentage': '.510'},
          'games_back': '19'}
         """
-        json = self.yhandler.get_standings_raw(self.league_id)
-        t = objectpath.Tree(json)
-        num_teams = int(t.execute('$..count[0]'))
-        standings = []
-        for i in range(num_teams):
-            team = {}
-            for e in t.execute('$..teams.."{}".team[0]'.format(i)):
-                if isinstance(e, list):
-                    for td in e:
-                        if "team_key" in td or 'name' in td:
-                            self._merge_dicts(team, td, [])
-                elif "team_standings" in e:
-                    self._merge_dicts(team, e['team_standings'], [])
-            standings.append(team)
-        return standings
+        return self._standings()[0]
 
     def teams(self):
         """Return details of all of the teams in the league.
@@ -131,20 +365,124 @@ class League:
                    'league_scoring_type', 'has_draft_grade',
                    'auction_budget_total', 'auction_budget_spent', 'managers'])
         """
-        json = self.yhandler.get_standings_raw(self.league_id)
-        t = objectpath.Tree(json)
-        num_teams = int(t.execute('$..count[0]'))
+        return self._standings()[1]
+
+    def _standings(self):
+        '''Return the parsed standings, fetching them when not cached
+
+        :return: The ordered standings and the team details keyed by team key
+        :rtype: (list(dict), dict)
+        '''
+        standings = self.standings_cache.get('S')
+        if standings is None:
+            standings = self.standings_cache['S'] = \
+                self._standings_from_json(
+                    self.yhandler.get_standings_raw(self.league_id))
+        return standings
+
+    def _standings_from_json(self, json):
+        '''Parse the standings and team details with one walk of the teams
+
+        :param json: JSON document returned from the standings API
+        :return: The ordered standings and the team details keyed by team key
+        :rtype: (list(dict), dict)
+        '''
+        lg_teams = json['fantasy_content']['league'][1]['standings'][0]['teams']
+        standings = []
         teams = {}
-        for i in range(num_teams):
+        for i in range(int(lg_teams['count'])):
+            entry = lg_teams[str(i)]['team']
+            standing = {}
             team = {}
-            key = None
-            for e in t.execute('$..teams.."{}".team[0][0]'.format(i)):
-                if "team_key" in e:
-                    key = e['team_key']
-                if isinstance(e, dict):
-                    self._merge_dicts(team, e, [])
-            teams[key] = team
-        return teams
+            for e in entry[0]:
+                if not isinstance(e, dict):
+                    continue
+                self._merge_dicts(team, e, [])
+                if "team_key" in e or "name" in e:
+                    self._merge_dicts(standing, e, [])
+            for e in entry[1:]:
+                if "team_standings" in e:
+                    self._merge_dicts(standing, e['team_standings'], [])
+            standings.append(standing)
+            teams[team.get('team_key')] = team
+        return (standings, teams)
+
+    def rosters(self, week=None, day=None):
+        """Return the roster of every team in the league
+
+        All of the rosters come back in a single request.  If neither week or
+        day is specified it will return today's rosters.
+
+        :param week: Week number of the rosters to get
+        :type week: int
+        :param day: Day to get the rosters
+        :type day: :class: datetime.date
+        :return: The roster of each team keyed by team key.  Each roster is in
+            the same form as :meth:`yahoo_fantasy_api.team.Team.roster`.
+        :rtype: dict
+
+        >>> rosters = lg.rosters(3)
+        >>> rosters['388.l.27081.t.5']
+        [{'player_id': 8578, 'name': 'John Doe', 'position_type': 'B',
+         'eligible_positions': ['C','1B'], 'selected_position': 'C',
+         'status': ''},
+         {'player_id': 8967, 'name': 'Joe Baseball', 'position_type': 'B',
+         'eligible_positions': ['SS'], 'selected_position': 'SS',
+         'status': 'DTD'}]
+        """
+        return self._rosters_from_json(
+            self.yhandler.get_league_rosters_raw(self.league_id, week=week,
+                                                 day=day))
+
+    def _rosters_from_json(self, json):
+        lg_teams = json['fantasy_content']['league'][1]['teams']
+        rosters = {}
+        for i in range(int(lg_teams['count'])):
+            entry = lg_teams[str(i)]['team']
+            team_key = next(e['team_key'] for e in entry[0]
+                            if isinstance(e, dict) and 'team_key' in e)
+            rosters[team_key] = \
+                self.to_team(team_key)._roster_from_team_json(entry)
+        return rosters
+
+    def pending_trades(self):
+        """Return the proposed trades of every team in the league
+
+        The pending trades of the teams are requested concurrently, up to
+        max_workers at a time.  A trade is listed under both of the teams in
+        it.
+
+        :return: The trades of each team keyed by team key.  Each list is in
+            the same form as
+            :meth:`yahoo_fantasy_api.team.Team.proposed_trades`.
+        :rtype: dict
+
+        >>> trades = lg.pending_trades()
+        >>> trades['396.l.49770.t.5']
+        [{'transaction_key': '396.l.49770.pt.1',
+          'status': 'proposed',
+          'trader_team_key': '396.l.49770.t.4',
+          'tradee_team_key': '396.l.49770.t.5',
+          'trader_players': [{'player_id': '4472',
+            'name': 'Drew Doughty',
+            'position_type': 'P'}],
+          'tradee_players': [{'player_id': '5689',
+            'name': 'Jacob Trouba',
+            'position_type': 'P'}]}]
+        """
+        team_keys = list(self.teams().keys())
+        return self._pending_trades_from_json(
+            team_keys, self._fetch_each(
+                lambda team_key: self.yhandler.get_team_transactions(
+                    self.league_id, team_key, 'pending_trade'),
+                team_keys))
+
+    def _pending_trades_from_json(self, team_keys, pages):
+        trades = {}
+        for (team_key, page) in zip(team_keys, pages):
+            trades[team_key] = \
+                self.to_team(team_key)._proposed_trades_from_json(page)
+        return trades
 
     def matchups(self, week=None):
         """Retrieve matchups data for a given week. Defaults to current week.
@@ -154,8 +492,7 @@ class League:
         :return: Matchup details as key/value pairs
         :rtype: dict
         """
-        json = self.yhandler.get_scoreboard_raw(self.league_id, week=week)
-        return json
+        return self._scoreboard(week).json
 
     def settings(self):
         """Return the league settings
@@ -182,20 +519,7 @@ class League:
          'trade_end_date': '2020-08-09', 'trade_ratify_type': 'vote', 'trade_reject_time': '2',
          'player_pool': 'ALL', 'cant_cut_list': 'none', 'can_trade_draft_picks': '1'}
         """  # noqa
-        if self.settings_cache is None:
-            json = self.yhandler.get_settings_raw(self.league_id)
-            data = {}
-            if "fantasy_content" in json:
-                content = json["fantasy_content"]
-                if "league" in content:
-                    self._merge_dicts(data, content["league"][0], [])
-                    # Filtering out 'roster_positions' and 'stat_categories'
-                    # because they can be found in other APIs.
-                    self._merge_dicts(data,
-                                      content["league"][1]["settings"][0],
-                                      ["roster_positions", "stat_categories"])
-            self.settings_cache = data
-        return self.settings_cache
+        return self._settings().settings
 
     def stat_categories(self):
         """Return the stat categories for a league
@@ -208,17 +532,7 @@ class League:
         [{'display_name': 'R', 'position_type': 'B'}, {'display_name': 'HR',
         'position_type': 'B'}, {'display_name': 'W', 'position_type': 'P'}]
         """
-        if self.stat_categories_cache is None:
-            t = objectpath.Tree(self.yhandler.get_settings_raw(self.league_id))
-            json = t.execute('$..stat_categories..stat')
-            simple_stat = []
-            for s in json:
-                # Omit stats that are only for display purposes
-                if 'is_only_display_stat' not in s:
-                    simple_stat.append({"display_name": s["display_name"],
-                                        "position_type": s["position_type"]})
-            self.stat_categories_cache = simple_stat
-        return self.stat_categories_cache
+        return self._settings().stat_categories
 
     def team_key(self):
         """Return the team_key for logged in users team in this league
@@ -229,11 +543,15 @@ class League:
         >>> lg.team_key()
         388.l.27081.t.5
         """
-        t = objectpath.Tree(self.yhandler.get_teams_raw())
-        json = t.execute('$..(team_key)')
-        for t in json:
-            if t['team_key'].startswith(self.league_id):
-                return t['team_key']
+        return self._team_key_from_json(self.yhandler.get_teams_raw())
+
+    def _team_key_from_json(self, json):
+        for game in extract.user_games(json):
+            for team in extract.collection(extract.sub(game, 'teams'),
+                                           'team'):
+                team_key = extract.fields(team)['team_key']
+                if team_key.startswith(self.league_id):
+                    return team_key
 
     def current_week(self):
         """Return the current week number of the league
@@ -244,11 +562,7 @@ class League:
         >>> lg.current_week()
         12
         """
-        if self.current_week_cache is None:
-            t = objectpath.Tree(self.yhandler.get_scoreboard_raw(
-                self.league_id))
-            self.current_week_cache = int(t.execute('$..current_week[0]'))
-        return self.current_week_cache
+        return self._scoreboard().current_week
 
     def end_week(self):
         """Return the ending week number of the league.
@@ -259,11 +573,36 @@ class League:
         >>> lg.end_week()
         24
         """
-        if self.end_week_cache is None:
-            t = objectpath.Tree(
-                self.yhandler.get_scoreboard_raw(self.league_id))
-            self.end_week_cache = int(t.execute('$..end_week[0]'))
-        return self.end_week_cache
+        return self._scoreboard().end_week
+
+    def _scoreboard(self, week=None):
+        '''Return the scoreboard snapshot of a week
+
+        The snapshot is shared by current_week(), end_week(), matchups() and
+        week_date_range().  The current week is refetched once it is older
+        than SCOREBOARD_TTL; weeks that are over are kept for good.
+
+        :param week: Week to get the scoreboard for.  None is the current week.
+        :rtype: Scoreboard
+        '''
+        sb = self._cached_scoreboard(week)
+        if sb is None:
+            sb = self._store_scoreboard(week, Scoreboard(
+                self.yhandler.get_scoreboard_raw(self.league_id, week)))
+        return sb
+
+    def _cached_scoreboard(self, week):
+        sb = self.scoreboard_cache.get(week)
+        if sb is None or sb.is_stale(self.SCOREBOARD_TTL):
+            return None
+        return sb
+
+    def _store_scoreboard(self, week, sb):
+        self.scoreboard_cache[week] = sb
+        # The current week's scoreboard can also answer for its week number
+        if week is None:
+            self.scoreboard_cache[sb.week] = sb
+        return sb
 
     def week_date_range(self, week):
         """Return the start and end date of a given week.
@@ -315,10 +654,11 @@ class League:
          'position_type': 'B',
          'eligible_positions': ['CF', 'RF', 'Util']}
         """
-        if position not in self.free_agent_cache:
-            self.free_agent_cache[position] = self._fetch_players(
-                'FA', position=position)
-        return self.free_agent_cache[position]
+        plyrs = self.free_agent_cache.get(position)
+        if plyrs is None:
+            plyrs = self._fetch_players('FA', position=position)
+            self.free_agent_cache[position] = plyrs
+        return plyrs
 
     def waivers(self):
         """Return the players currently on waivers.
@@ -346,9 +686,10 @@ class League:
           'eligible_positions': ['D', 'IR'],
           'percent_owned': 87}]
         """
-        if not self.waivers_cache:
-            self.waivers_cache = self._fetch_players('W')
-        return self.waivers_cache
+        plyrs = self.waivers_cache.get('W')
+        if plyrs is None:
+            plyrs = self.waivers_cache['W'] = self._fetch_players('W')
+        return plyrs
 
     def taken_players(self):
         """Return the players taken by teams.
@@ -367,9 +708,43 @@ class League:
          'percent_owned': 99,
          'status': ''}
         """
-        if not self.taken_players_cache:
-            self.taken_players_cache = self._fetch_players('T')
-        return self.taken_players_cache
+        plyrs = self.taken_players_cache.get('T')
+        if plyrs is None:
+            plyrs = self.taken_players_cache['T'] = self._fetch_players('T')
+        return plyrs
+
+    def iter_free_agents(self, position):
+        """Generate the free agents for the given position as they arrive
+
+        Unlike free_agents(), players are generated a page at a time as each
+        page comes back from Yahoo!, and no more pages are fetched once the
+        caller stops.  The result is not cached.
+
+        :param position: All free agents must be able to play this position.
+             Use the short code of the position (e.g. 2B, C, etc.).  You can
+             also specify the position type (e.g. 'B' for all batters and 'P'
+             for all pitchers).
+        :type position: str
+        :return: Free agents, in the same form as free_agents()
+
+        >>> import itertools
+        >>> top = list(itertools.islice(lg.iter_free_agents('C'), 10))
+        """
+        return self._iter_players('FA', position=position)
+
+    def iter_waivers(self):
+        """Generate the players on waivers as they arrive
+
+        :return: Players on waivers, in the same form as waivers()
+        """
+        return self._iter_players('W')
+
+    def iter_taken_players(self):
+        """Generate the players taken by teams as they arrive
+
+        :return: Players taken by teams, in the same form as taken_players()
+        """
+        return self._iter_players('T')
 
     def _fetch_players(self, status, position=None):
         """Fetch players from Yahoo!
@@ -384,11 +759,21 @@ class League:
         :return: Players found.
         :rtype: List(Dict)
         """
+        return list(self._iter_players(status, position=position))
+
+    def _iter_players(self, status, position=None):
+        """Generate players from Yahoo! a page at a time
+
+        Takes the same parameters as _fetch_players.
+        """
         # The Yahoo! API we use doles out players 25 per page.  We need to make
         # successive calls to gather all of the players.  We stop when we fetch
         # less then 25.
         PLAYERS_PER_PAGE = 25
-        plyrs = []
+        if self.max_workers > 1:
+            yield from self._iter_players_parallel(status, position,
+                                                   PLAYERS_PER_PAGE)
+            return
         plyrIndex = 0
         while plyrIndex % PLAYERS_PER_PAGE == 0:
             j = self.yhandler.get_players_raw(self.league_id, plyrIndex,
@@ -396,14 +781,48 @@ class League:
             (num_plyrs_on_pg, fa_on_pg) = self._players_from_page(j)
             if len(fa_on_pg) == 0:
                 break
-            plyrs += fa_on_pg
+            yield from fa_on_pg
             plyrIndex += num_plyrs_on_pg
-        return plyrs
+
+    def _iter_players_parallel(self, status, position, page_size):
+        """Generate players from Yahoo! keeping several pages in flight
+
+        A window of max_workers pages is requested up front.  The pages are
+        consumed in order, and each one consumed schedules the next.  We stop
+        scheduling once a short page is seen or the caller stops.
+
+        :return: Players found, in the same order as _iter_players
+        """
+        pending = collections.deque()
+        next_start = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            def submit(start):
+                pending.append(executor.submit(
+                    self.yhandler.get_players_raw, self.league_id, start,
+                    status, position=position))
+
+            try:
+                for _ in range(self.max_workers):
+                    submit(next_start)
+                    next_start += page_size
+                while pending:
+                    (num_plyrs_on_pg, fa_on_pg) = self._players_from_page(
+                        pending.popleft().result())
+                    if len(fa_on_pg) == 0 or num_plyrs_on_pg < page_size:
+                        yield from fa_on_pg
+                        break
+                    submit(next_start)
+                    next_start += page_size
+                    yield from fa_on_pg
+            finally:
+                for f in pending:
+                    f.cancel()
 
     def _players_from_page(self, page):
         """Extract the players from a given JSON page
 
-        This is to used with _fetch_players.
+        This is to used with _fetch_players.  The players are pulled out with
+        a single walk over fantasy_content.league[1].players.
 
         :param page: JSON page to extract players from
         :type page: dict
@@ -413,65 +832,57 @@ class League:
         """
         fa = []
 
-        if len(page['fantasy_content']['league'][1]['players']) == 0:
+        players = page['fantasy_content']['league'][1]['players']
+        if len(players) == 0:
             return (0, fa)
 
-        t = objectpath.Tree(page)
-        pct_owns = self._pct_owned_from_page(iter(list(t.execute(
-            '$..percent_owned.(coverage_type,value)'))))
-        # When iterating over the players we step by 2 to account for the
-        # percent_owned data that is stored adjacent to each player.
-        for i, pct_own in zip(range(0, t.execute('$..players.count[0]') * 2, 2),
-                              pct_owns):
-            path = '$..players..player[{}].'.format(i) + \
-                "(name,player_id,position_type,status,eligible_positions)"
-            obj = list(t.execute(path))
+        num_plyrs = int(players['count'])
+        game_id = self._game_id()
+        for i in range(num_plyrs):
+            # Each player is a list with the player data first.  When we ask
+            # for the percent owned it is stored in a dict adjacent to it.
+            entry = players[str(i)]['player']
+            self.player_store.add(game_id, entry[0])
             plyr = {}
-            # Convert obj from a list of dicts to a single one-dimensional dict
-            for ele in obj:
-                for k in ele.keys():
-                    plyr[k] = ele[k]
+            for ele in entry[0]:
+                if not isinstance(ele, dict):
+                    continue
+                for k, v in ele.items():
+                    if k in self.PAGE_PLAYER_KEYS:
+                        plyr[k] = v
             plyr['player_id'] = int(plyr['player_id'])
             plyr['name'] = plyr['name']['full']
             # We want to return eligible positions in a concise format.
             plyr['eligible_positions'] = [e['position'] for e in
                                           plyr['eligible_positions']]
-            plyr['percent_owned'] = pct_own
+            plyr['percent_owned'] = self._pct_owned_from_player(entry)
             if "status" not in plyr:
                 plyr["status"] = ""
 
             # Ignore players that are not active
             if plyr["status"] != "NA":
                 fa.append(plyr)
-        return (i / 2 + 1, fa)
+        return (num_plyrs, fa)
 
-    def _pct_owned_from_page(self, po_it):
-        """Extract the ownership % of players taken from a player JSON dump
+    def _pct_owned_from_player(self, entry):
+        """Extract the ownership % of a player from a player JSON entry
 
-        Why does this function even need to exist?  When requesting ownership
-        percentage when getting players, the ownership percentage is
-        included adjacent to the rest of the player data.  So it cannot be
-        retrieved easily along side the player data and must be extracted
-        separately.
+        When requesting ownership percentage when getting players, the
+        ownership percentage is included in a dict adjacent to the rest of the
+        player data.
 
-        :param po_it: Extracted ownership % from objectpath
-        :type eles: iterator over a list
-        :return: Ownership percentages of each player on the JSON page
-        :rtype: list(int)
+        :param entry: The 'player' list of a single player
+        :type entry: list
+        :return: Ownership percentage of the player.  0 if not present.
+        :rtype: int
         """
-        po = []
-        i = 0
-        try:
-            while True:
-                ele = next(po_it)
-                if "coverage_type" in ele:
-                    po.append(0)
-                    i += 1
-                if "value" in ele:
-                    po[i - 1] = ele['value']
-        except StopIteration:
-            pass
-        return po
+        pct_own = 0
+        for ele in entry[1:]:
+            if isinstance(ele, dict) and 'percent_owned' in ele:
+                for po in ele['percent_owned']:
+                    if 'value' in po:
+                        pct_own = po['value']
+        return pct_own
 
     def _date_range_of_played_or_current_week(self, week):
         """Get the date range of a week that was already played or the current
@@ -483,14 +894,23 @@ class League:
         :return: Start and end date of the given week
         :rtype: Tuple of two :class: datetime.date objects
         """
-        if week not in self.week_date_range_cache:
-            t = objectpath.Tree(self.yhandler.get_scoreboard_raw(
-                self.league_id, week))
-            j = t.execute('$..(week_start,week_end)[0]')
-            self.week_date_range_cache[week] = (
-                datetime.datetime.strptime(j['week_start'], "%Y-%m-%d").date(),
-                datetime.datetime.strptime(j['week_end'], "%Y-%m-%d").date())
-        return self.week_date_range_cache[week]
+        date_range = self.week_date_range_cache.get(week)
+        if date_range is None:
+            date_range = self.week_date_range_cache[week] = \
+                self._date_range_from_scoreboard(self._scoreboard(week))
+        return date_range
+
+    def _date_range_from_scoreboard(self, scoreboard):
+        """Return the date range of a scoreboard's week
+
+        Raises a RuntimeError if the scoreboard has no matchups to take it
+        from, rather than letting None into the week date range cache.
+        """
+        if scoreboard.date_range is None:
+            raise RuntimeError("The scoreboard of week {} has no matchups to "
+                               "get the date range from".format(
+                                   scoreboard.week))
+        return scoreboard.date_range
 
     def player_details(self, player):
         """
@@ -538,11 +958,72 @@ class League:
         """
         if isinstance(player, int):
             player = [player]
-        self._cache_player_details(player)
+        fetched = self._cache_player_details(player)
+        return self._player_details_from_cache(player, fetched)
+
+    def player_metadata(self, player_ids):
+        """Return the metadata of players, without any stats
+
+        The metadata is looked up in the player store that is shared by all
+        of the leagues of a game in this process.  Only the players that
+        aren't in it are fetched from Yahoo!.  The store is also filled in by
+        player_details(), free_agents(), player_stats() and Team.roster().
+
+        :param player_ids: Yahoo! Player IDs to get the metadata for
+        :type player_ids: list(int)
+        :return: Metadata of each player, in the order of player_ids
+        :rtype: list(dict)
+
+        >>> lg.player_metadata([3983])
+        [{'player_key': '396.p.3983',
+          'player_id': '3983',
+          'name': {'full': 'Phil Kessel', ...},
+          'editorial_team_abbr': 'Ari',
+          'display_position': 'RW',
+          'headshot': {...},
+          'eligible_positions': [{'position': 'RW'}],
+          ...
+        }]
+        """
+        found = self._player_metadata_from_store(player_ids)
+        missing = [p for p in player_ids if p not in found]
+        for page in self._fetch_batches(
+                lambda ids: self.yhandler.get_player_raw(
+                    self.league_id, ids=ids, stats=False), missing):
+            found.update(self._player_metadata_from_json(page))
+        return [found[p] for p in player_ids]
+
+    def _player_metadata_from_store(self, player_ids):
+        found = {}
+        for p in player_ids:
+            meta = self.player_store.get(self._game_id(), p)
+            if meta is not None:
+                found[p] = meta
+        return found
+
+    def _player_metadata_from_json(self, json):
+        found = {}
+        for entry in self._player_entries(json):
+            self.player_store.add(self._game_id(), entry[0])
+            meta = self.player_store.metadata(entry[0])
+            found[int(meta['player_id'])] = meta
+        return found
+
+    def _game_id(self):
+        return self.league_id[0:self.league_id.find('.')]
+
+    def _player_details_from_cache(self, player, fetched):
+        # Prefer the details just fetched, as they may already be evicted
+        # from the cache.
         players = []
         if isinstance(player, list):
             for p in player:
-                players.append(self.player_details_cache[p])
+                if p in fetched:
+                    players.append(fetched[p])
+                else:
+                    players.append(self.player_details_cache[p])
+        elif player in fetched:
+            players = fetched[player]
         elif player in self.player_details_cache:
             assert(isinstance(self.player_details_cache[player], list))
             players = self.player_details_cache[player]
@@ -551,68 +1032,131 @@ class League:
     def percent_owned(self, player_ids):
         """Retrieve ownership percentage of a list of players
 
+        Any number of players can be asked for.  They are fetched in batches
+        of 25, up to max_workers batches at a time.
+
         :param player_ids: Yahoo! Player IDs to retrieve % owned for
         :type player_ids: list(int)
-        :return: Ownership percentage of players requested
-        :rtype: dict
+        :return: Ownership percentage of players requested, keyed by the
+            player ID as a str, like ownership()
+        :rtype: dict(str, dict)
+
+        >>> lg.percent_owned([3737, 6381, 4003, 3705])
+        {'3737': {'player_id': 3737, 'name': 'Sidney Crosby',
+                  'percent_owned': 100},
+         '6381': {'player_id': 6381, 'name': 'Dylan Larkin',
+                  'percent_owned': 89},
+         '4003': {'player_id': 4003, 'name': 'Semyon Varlamov',
+                  'percent_owned': 79},
+         '3705': {'player_id': 3705, 'name': 'Dustin Byfuglien',
+                  'percent_owned': 82}}
+        """
+        po = {}
+        for page in self._fetch_batches(
+                lambda ids: self.yhandler.get_percent_owned_raw(
+                    self.league_id, ids), player_ids):
+            po.update(self._percent_owned_from_json(page))
+        return po
 
-        >>> lg.percent_owned(1, [3737, 6381, 4003, 3705])
-        [{'player_id': 3737, 'name': 'Sidney Crosby', 'percent_owned': 100},
-         {'player_id': 6381, 'name': 'Dylan Larkin', 'percent_owned': 89},
-         {'player_id': 4003, 'name': 'Semyon Varlamov', 'percent_owned': 79},
-         {'player_id': 3705, 'name': 'Dustin Byfuglien', 'percent_owned': 82}]
-        """
-        t = objectpath.Tree(self.yhandler.get_percent_owned_raw(
-            self.league_id, player_ids))
-        player_ids = t.execute("$..player_id")
-        it = t.execute("$..(player_id,full,value)")
-        po = []
-        try:
-            while True:
-                plyr = {"player_id": int(next(it)["player_id"]),
-                        "name": next(it)["full"],
-                        "percent_owned": next(it)["value"]}
-                po.append(plyr)
-        except StopIteration:
-            pass
+    def _percent_owned_from_json(self, json):
+        po = {}
+        for entry in self._player_entries(json):
+            meta = self._player_meta(entry)
+            po[meta['player_id']] = {
+                "player_id": int(meta['player_id']),
+                "name": meta.get('name', {}).get('full'),
+                "percent_owned": self._pct_owned_from_player(entry)}
         return po
 
     def ownership(self, player_ids):
         """Retrieve the owner of a player
 
+        Any number of players can be asked for.  They are fetched in batches
+        of 25, up to max_workers batches at a time.
+
         :param player_ids: Yahoo! Player IDs to retrieve owned for
         :type player_ids: list(int)
-        :return: Ownership status of player
-        :rtype: dict
+        :return: Ownership status of the players, keyed by the player ID as
+            a str, like percent_owned()
+        :rtype: dict(str, dict)
 
         >>> lg.ownership([3737])
-        {"3737" : {"ownership_tpye" : "team", "owner_team_name": "team name"}}
+        {'3737': {'ownership_type': 'team', 'owner_team_name': 'team name'}}
         """
-        t = objectpath.Tree(self.yhandler.get_player_ownership_raw(self.league_id, player_ids))
-        owner_details = t.execute("$..(player_id,ownership_type,owner_team_name)")
         ownership = {}
-        try:
-            while True:
-                player_id = next(owner_details)['player_id']
-                ownership_details = next(owner_details)
-                ownership[player_id] = ownership_details
-        except StopIteration:
-            pass
+        for page in self._fetch_batches(
+                lambda ids: self.yhandler.get_player_ownership_raw(
+                    self.league_id, ids), player_ids):
+            ownership.update(self._ownership_from_json(page))
+        return ownership
+
+    def _ownership_from_json(self, json):
+        ownership = {}
+        for entry in self._player_entries(json):
+            details = {}
+            for ele in entry[1:]:
+                if isinstance(ele, dict) and 'ownership' in ele:
+                    details = {k: v for k, v in ele['ownership'].items()
+                               if k in ('ownership_type', 'owner_team_name')}
+            ownership[self._player_meta(entry)['player_id']] = details
         return ownership
 
+    def _player_entries(self, json):
+        """Generate the 'player' list of each player in a players collection
+
+        :param json: JSON document of a league/{id}/players or a players
+            request
+        :type json: dict
+        """
+        content = extract.fantasy_content(json)
+        if 'players' in content:
+            players = content['players']
+        else:
+            players = content['league'][1]['players']
+        return extract.collection(players, 'player')
+
+    def _player_meta(self, entry):
+        """Merge the player data of a 'player' list into one dict"""
+        return extract.fields(entry)
+
+    def _player_id_batches(self, player_ids):
+        # Yahoo! returns at most 25 players per request
+        return [player_ids[i:i + 25] for i in range(0, len(player_ids), 25)]
+
+    def _fetch_batches(self, fetch, player_ids):
+        """Call fetch for each batch of player IDs and return the results
+
+        :param fetch: Function that takes a list of at most 25 player IDs
+        :param player_ids: All of the player IDs to fetch
+        :type player_ids: list(int)
+        :rtype: list
+        """
+        return self._fetch_each(fetch, self._player_id_batches(player_ids))
+
+    def _fetch_each(self, fetch, args):
+        """Call fetch for each argument and return the results
+
+        The requests are sent concurrently, up to max_workers at a time.  The
+        results are returned in the order of the arguments.
+
+        :param fetch: Function that sends one request
+        :param args: Argument to call fetch with for each request
+        :type args: list
+        :rtype: list
+        """
+        if self.max_workers > 1 and len(args) > 1:
+            with ThreadPoolExecutor(
+                    max_workers=min(self.max_workers, len(args))) as executor:
+                return list(executor.map(fetch, args))
+        return [fetch(arg) for arg in args]
+
     def edit_date(self):
         """Return the next day that you can edit the lineups.
 
         :return: edit date
         :rtype: :class: datetime.date
         """
-        if self.edit_date_cache is None:
-            json = self.yhandler.get_settings_raw(self.league_id)
-            t = objectpath.Tree(json)
-            edit_key = t.execute('$..edit_key[0]')
-            self.edit_date_cache = \
-                datetime.datetime.strptime(edit_key, '%Y-%m-%d').date()
-        return self.edit_date_cache
+        return self._settings().edit_date
 
     def positions(self):
         """Return the positions that are used in the league.
@@ -630,20 +1174,7 @@ class League:
          'BN': {'count': 2},
          'IR': {'count': '3'}}
         """
-        if self.positions_cache is None:
-            json = self.yhandler.get_settings_raw(self.league_id)
-            t = objectpath.Tree(json)
-            pmap = {}
-            for p in t.execute('$..roster_position'):
-                pmap[p['position']] = {}
-                for k, v in p.items():
-                    if k == 'position':
-                        continue
-                    if k == 'count':
-                        v = int(v)
-                    pmap[p['position']][k] = v
-            self.positions_cache = pmap
-        return self.positions_cache
+        return self._settings().positions
 
     def player_stats(self, player_ids, req_type, date=None, week=None, season=None):
         """Return stats for a list of players
@@ -707,15 +1238,14 @@ class League:
         if not isinstance(player_ids, list):
             player_ids = [player_ids]
 
-        lg_settings = self.settings()
-        game_code = lg_settings['game_code']
-        self._cache_stats_id_map(game_code)
+        self._cache_stats_id_map(self._settings().game_code)
+
+        def fetch(ids):
+            return self._fetch_plyr_stats(ids, req_type, date, week, season)
+
         stats = []
-        while len(player_ids) > 0:
-            next_player_ids = player_ids[0:25]
-            player_ids = player_ids[25:]
-            stats += self._fetch_plyr_stats(next_player_ids,
-                                            req_type, date, week, season)
+        for batch_stats in self._fetch_batches(fetch, player_ids):
+            stats += batch_stats
         return stats
 
     def draft_results(self):
@@ -750,21 +1280,19 @@ class League:
          'player_id': 9490}
         '''
         j = self.yhandler.get_draftresults_raw(self.league_id)
-        t = objectpath.Tree(j)
+        return self._draft_results_from_json(j)
+
+    def _draft_results_from_json(self, j):
         dres = []
-        pat = re.compile(r'.*\.p\.([0-9]+)$')
-        for p in t.execute('$..draft_results..draft_result'):
-            try:
-                pk = p['player_key']
-                m = pat.search(pk)
-                if m:
-                    pid = int(m.group(1))
-                    p['player_id'] = pid
-                    del p['player_key']
-                dres.append(p)
-            except KeyError:
-                pass
-        return(dres)
+        for p in extract.collection(extract.league(j)[1].get('draft_results'),
+                                    'draft_result'):
+            # Picks that haven't been made yet have no player
+            if 'player_key' not in p:
+                continue
+            pick = {k: v for k, v in p.items() if k != 'player_key'}
+            pick['player_id'] = extract.player_id(p['player_key'])
+            dres.append(pick)
+        return dres
 
     def transactions(self, tran_types, count):
         '''
@@ -788,12 +1316,70 @@ class League:
         ]
         '''
         j = self.yhandler.get_transactions_raw(self.league_id, tran_types, count)
-        t = objectpath.Tree(j).execute('$..transactions..transaction')
-        transactions = []
-        for transaction_details in t:
-            players = next(t)
-            transactions.append({**transaction_details, **players})
-        return transactions
+        return self._transactions_from_json(j)
+
+    def sync_transactions(self, cursor, tran_types='add,drop,commish,trade',
+                          page_size=25):
+        """Generate the transactions that are newer than the cursor
+
+        Pages of transactions are fetched, most recent first, only until the
+        last transaction the cursor has seen is reached.  The new ones are
+        then generated oldest first.  The cursor is moved past a transaction
+        only when the caller asks for the next one, or the generator ends.
+        So a transaction the caller failed to handle, and any after it, are
+        generated again on the next sync.  If the cursor has nothing for the
+        league all of its transactions are generated.
+
+        :param cursor: Cursor that tracks the last transaction seen
+        :type cursor: TransactionCursor
+        :param tran_types: The comma separated types of transactions to sync.
+            Valid values are: add,drop,commish,trade
+        :type tran_types: str
+        :param page_size: Number of transactions to fetch per request
+        :type page_size: int
+        :return: Transactions in the same form as :meth:`transactions`
+
+        >>> cursor = TransactionCursor.load('cursor.json')
+        >>> for t in lg.sync_transactions(cursor, 'add,drop,trade'):
+        ...     notify(t)
+        >>> cursor.save('cursor.json')
+        """
+        last_id = cursor.position(self.league_id, tran_types)
+        new = []
+        start = 0
+        while True:
+            page = self._transactions_from_json(
+                self.yhandler.get_transactions_raw(
+                    self.league_id, tran_types, page_size, start=start))
+            (page_new, done) = self._new_transactions(page, last_id,
+                                                      page_size)
+            new += page_new
+            if done:
+                break
+            start += page_size
+        for transaction in reversed(new):
+            yield transaction
+            # The caller is back for more, so it is done with this one
+            cursor.advance(self.league_id, tran_types, transaction)
+
+    def _new_transactions(self, page, last_id, page_size):
+        """Return the transactions of a page newer than last_id
+
+        :return: The new transactions and True if no more pages are needed
+        :rtype: (list, bool)
+        """
+        new = []
+        for transaction in page:
+            if last_id is not None and \
+                    int(transaction['transaction_id']) <= last_id:
+                return (new, True)
+            new.append(transaction)
+        return (new, len(page) < page_size)
+
+    def _transactions_from_json(self, j):
+        return [extract.merge(transaction) for transaction in
+                extract.collection(extract.league(j)[1].get('transactions'),
+                                   'transaction')]
 
     def _fetch_plyr_stats(self, player_ids, req_type, date, week, season):
         '''
@@ -811,31 +1397,32 @@ class League:
         assert(len(player_ids) > 0 and len(player_ids) <= 25)
         json = self.yhandler.get_player_stats_raw(self.league_id, player_ids,
                                                   req_type, date, week, season)
-        t = objectpath.Tree(json)
+        for entry in self._player_entries(json):
+            self.player_store.add(self._game_id(), entry[0])
+        return self._plyr_stats_from_json(json)
+
+    def _plyr_stats_from_json(self, json):
         stats = []
-        row = None
-        for e in t.execute('$..(full,player_id,position_type,stat,total)'):
-            if 'player_id' in e:
-                if row is not None:
-                    stats.append(row)
-                row = {}
-                row['player_id'] = int(e['player_id'])
-            elif 'full' in e:
-                row['name'] = e['full']
-            elif 'position_type' in e:
-                row['position_type'] = e['position_type']
-            elif 'stat' in e:
-                stat_id = int(e['stat']['stat_id'])
-                try:
-                    val = float(e['stat']['value'])
-                except ValueError:
-                    val = e['stat']['value']
-                if stat_id in self.stats_id_map:
-                    row[self.stats_id_map[stat_id]] = val
-            elif 'total' in e:
-                row['total_points'] = e['total']
-
-        if row is not None:
+        for entry in self._player_entries(json):
+            meta = self._player_meta(entry)
+            row = {'player_id': int(meta['player_id'])}
+            if 'name' in meta:
+                row['name'] = meta['name']['full']
+            if 'position_type' in meta:
+                row['position_type'] = meta['position_type']
+            for resource in ('player_stats', 'player_advanced_stats'):
+                player_stats = extract.sub(entry, resource, {})
+                for s in player_stats.get('stats', []):
+                    stat_id = int(s['stat']['stat_id'])
+                    try:
+                        val = float(s['stat']['value'])
+                    except ValueError:
+                        val = s['stat']['value']
+                    if stat_id in self.stats_id_map:
+                        row[self.stats_id_map[stat_id]] = val
+            player_points = extract.sub(entry, 'player_points')
+            if player_points is not None and 'total' in player_points:
+                row['total_points'] = player_points['total']
             stats.append(row)
         return stats
 
@@ -845,16 +1432,23 @@ class League:
         The self.stats_id_map will map the stat ID to a display name.
         '''
         if self.stats_id_map is None:
-            json = self.yhandler.get_settings_raw(self.league_id)
-            t = objectpath.Tree(json)
             # Start with the static map of category ID map.  The stats API
             # generates a lot of stats, where as the ones we are getting the
             # settings are only the categories that scoring is based on.
             stats_id_map = self._get_static_id_map(game_code)
-            for s in t.execute('$..stat_categories..(stat_id,display_name)'):
-                stats_id_map[int(s['stat_id'])] = s['display_name']
+            stats_id_map.update(self._settings().stat_names)
             self.stats_id_map = stats_id_map
 
+    def _settings(self):
+        '''Return the settings snapshot, fetching it on first use
+
+        :rtype: LeagueSettings
+        '''
+        if self.settings_snapshot is None:
+            self.settings_snapshot = LeagueSettings(
+                self.yhandler.get_settings_raw(self.league_id))
+        return self.settings_snapshot
+
     def _get_static_id_map(self, game_code):
         '''
         Get a static map of ID to stat names for specific sport
@@ -938,32 +1532,44 @@ class League:
     def _cache_player_details(self, player):
         '''
         Helper to ensure request for player is in the cache.
+
+        :return: The details that had to be fetched, keyed the same as the
+            cache
+        :rtype: dict
         '''
         lookup = self._calc_lookup_for_player_detail(player)
-        while lookup is not None and (not isinstance(lookup, list) or
-                                      len(lookup) > 0):
-            if isinstance(player, list):
-                ids = lookup.pop()
-                t = objectpath.Tree(self.yhandler.get_player_raw(
-                    self.league_id, ids=ids))
-            else:
-                t = objectpath.Tree(self.yhandler.get_player_raw(
-                    self.league_id, search=lookup))
-                key = lookup
-                lookup = None
-
-            for json in t.execute('$..players'):
-                if json == []:
-                    continue
-                for i in range(int(json['count'])):
-                    details = self._parse_player_detail(json[str(i)]['player'])
-                    if isinstance(lookup, list):   # Cache by player ID
-                        key = int(details['player_id'])
-                        self.player_details_cache[key] = details
-                    else:  # Cache by search string
-                        if key not in self.player_details_cache:
-                            self.player_details_cache[key] = []
-                        self.player_details_cache[key].append(details)
+        fetched = {}
+        if isinstance(player, list):
+            for ids in lookup:
+                fetched.update(self._cache_player_details_from_json(
+                    self.yhandler.get_player_raw(self.league_id, ids=ids)))
+        elif lookup is not None:
+            fetched.update(self._cache_player_details_from_json(
+                self.yhandler.get_player_raw(self.league_id, search=lookup),
+                search=lookup))
+        return fetched
+
+    def _cache_player_details_from_json(self, json, search=None):
+        '''
+        Helper to add the players of a player details response to the cache.
+
+        :param json: JSON document returned from the player API
+        :param search: The search string used for the request.  If None, the
+            request was for player IDs and each player is cached by its ID.
+        :return: The entries added to the cache
+        :rtype: dict
+        '''
+        added = {}
+        for entry in self._player_entries(json):
+            self.player_store.add(self._game_id(), entry[0])
+            details = self._parse_player_detail(entry)
+            if search is None:   # Cache by player ID
+                added[int(details['player_id'])] = details
+            else:  # Cache by search string
+                added.setdefault(search, []).append(details)
+        for key, details in added.items():
+            self.player_details_cache[key] = details
+        return added
 
     def _calc_lookup_for_player_detail(self, player):
         '''
@@ -1,11 +1,9 @@
 #!/bin/python
 
-from yahoo_fantasy_api import yhandler
-import objectpath
+from yahoo_fantasy_api import cache, extract, yhandler
 import datetime
-from xml.dom.minidom import Document
 
-from yahoo_fantasy_api.utils import create_element
+from yahoo_fantasy_api.utils import create_element, new_document
 
 
 class Team:
@@ -16,14 +14,21 @@ class Team:
     :param team_key: Team key identifier for the team we are constructing this
         object for.
     :type team_key: str
+    :param handler: Handler to send the requests through.  If None, the
+        handler shared by the session context is used.
+    :type handler: YHandler
     """
 
-    def __init__(self, sc, team_key):
+    def __init__(self, sc, team_key, handler=None):
         self.sc = sc
         self.team_key = team_key
         self.league_id = team_key[0:team_key.find(".t")]
         self.league_prefix = team_key[0:team_key.find('.')]
-        self.yhandler = yhandler.YHandler(sc)
+        if handler:
+            self.yhandler = handler
+        else:
+            self.yhandler = yhandler.get_handler(sc)
+        self.player_store = cache.PLAYER_STORE
 
     def inject_yhandler(self, yhandler):
         self.yhandler = yhandler
@@ -38,9 +43,14 @@ class Team:
          'url': 'http://baseball.fantasysports.yahoo.com/archive/mlb/2013/27081/9',
          'team_logos': [{'team_logo': {'size': 'large', 'url': 'http://l.yimg
         """
-        t = objectpath.Tree(self.yhandler.get_teams_by_keys_raw([self.team_key]))
-        json = t.execute('$..teams..team[0]')
-        details = {k: v for dic in [val for val in json if val != []] for k, v in dic.items()}
+        return self._details_from_json(
+            self.yhandler.get_teams_by_keys_raw([self.team_key]))
+
+    def _details_from_json(self, json):
+        teams = extract.fantasy_content(json)['teams']
+        details = {}
+        for team in extract.collection(teams, 'team'):
+            details.update(extract.fields(team))
         return details
 
     def matchup(self, week):
@@ -53,11 +63,16 @@ class Team:
         >>> tm.matchup(3)
         388.l.27081.t.9
         """
-        t = objectpath.Tree(self.yhandler.get_matchup_raw(self.team_key, week))
-        json = t.execute('$..matchups..(team_key)')
-        for k in json:
-            if 'team_key' in k:
-                this_team_key = k['team_key']
+        return self._matchup_from_json(
+            self.yhandler.get_matchup_raw(self.team_key, week))
+
+    def _matchup_from_json(self, json):
+        matchups = extract.sub(extract.fantasy_content(json)['team'],
+                               'matchups')
+        for matchup in extract.collection(matchups, 'matchup'):
+            teams = matchup.get('0', {}).get('teams')
+            for team in extract.collection(teams, 'team'):
+                this_team_key = extract.fields(team)['team_key']
                 if this_team_key != self.team_key:
                     return this_team_key
         raise RuntimeError("Could not find opponent")
@@ -86,10 +101,21 @@ class Team:
          'eligible_positions': ['RP'], 'status': ''}]
         """
         raw = self.yhandler.get_roster_raw(self.team_key, week=week, day=day)
-        t = objectpath.Tree(raw)
+        return self._roster_from_json(raw)
+
+    def _roster_from_json(self, raw):
+        return self._roster_from_team_json(raw['fantasy_content']['team'])
 
+    def _roster_from_team_json(self, team):
+        """Parse the roster of one team
+
+        :param team: The team entry, [team meta, {'roster': ...}].  This is
+            the same in the team API and the team collections.
+        :type team: list
+        :return: Array of players in the same form as :meth:`roster`
+        """
         # Navigate to the players in the roster.
-        roster_obj = t.execute('$.fantasy_content.team[1].roster')
+        roster_obj = team[1].get('roster') if len(team) > 1 else None
         if not roster_obj:
             return []
 
@@ -136,6 +162,7 @@ class Team:
 
             player_data = player[0]
             selected_position_data = player[1]
+            self.player_store.add(self.league_prefix, player_data)
 
             # Extract fields from player_data (list of dicts).
             plyr = {}
@@ -203,6 +230,7 @@ class Team:
         """
         xml = self._construct_transaction_xml("add", player_id)
         self.yhandler.post_transactions(self.league_id, xml)
+        self._invalidate_league_caches()
 
     def claim_player(self, player_id, faab=None):
         """Submit a waiver claim for a single player by their player ID
@@ -216,6 +244,7 @@ class Team:
         """
         xml = self._construct_transaction_xml("add", player_id, faab=faab)
         self.yhandler.post_transactions(self.league_id, xml)
+        self._invalidate_league_caches()
 
     def drop_player(self, player_id):
         """Drop a single player by their player ID
@@ -227,6 +256,7 @@ class Team:
         """
         xml = self._construct_transaction_xml("drop", player_id)
         self.yhandler.post_transactions(self.league_id, xml)
+        self._invalidate_league_caches()
 
     def add_and_drop_players(self, add_player_id, drop_player_id):
         """Add one player and drop another in the same transaction
@@ -241,6 +271,7 @@ class Team:
         xml = self._construct_transaction_xml("add/drop", add_player_id,
                                               drop_player_id)
         self.yhandler.post_transactions(self.league_id, xml)
+        self._invalidate_league_caches()
 
     def claim_and_drop_players(self, add_player_id, drop_player_id, faab=None):
         """Submit a waiver claim for one player and drop another in the same transaction
@@ -258,6 +289,15 @@ class Team:
             "add/drop", add_player_id, drop_player_id, faab=faab
         )
         self.yhandler.post_transactions(self.league_id, xml)
+        self._invalidate_league_caches()
+
+    def _invalidate_league_caches(self):
+        """Drop the player lists of the leagues in this process
+
+        After a roster move the cached free agents, waivers and taken players
+        of this team's league are out of date.
+        """
+        cache.invalidate_league(self.league_id, cache.ROSTER_MOVE_KINDS)
 
     def proposed_trades(self):
         """
@@ -301,40 +341,41 @@ class Team:
         """
         j = self.yhandler.get_team_transactions(self.league_id, self.team_key,
                                                 "pending_trade")
-        t = objectpath.Tree(j)
+        return self._proposed_trades_from_json(j)
+
+    def _proposed_trades_from_json(self, j):
+        return self._proposed_trades_from_transactions(
+            extract.league(j)[1].get('transactions'))
+
+    def _proposed_trades_from_transactions(self, transactions):
+        """Parse a collection of pending trades with one walk over it
+
+        :param transactions: The transactions collection of a pending_trade
+            request
+        :return: The trades in the form returned by proposed_trades()
+        :rtype: list(dict)
+        """
         trans = []
-        trans_it = t.execute('''$..transaction.(transaction_key,
-                                                status,
-                                                trader_team_key,
-                                                tradee_team_key)''')
-        for i, tran in enumerate(trans_it):
+        for transaction in extract.collection(transactions, 'transaction'):
+            meta = extract.fields(transaction)
+            tran = {k: meta[k] for k in ('transaction_key', 'status',
+                                         'trader_team_key', 'tradee_team_key')
+                    if k in meta}
             tran["trader_players"] = []
             tran["tradee_players"] = []
-
-            def append_player(plyr):
-                """Helper to append a player to proper team list"""
-                trader_tm = plyr["source_team_key"] == tran["trader_team_key"]
-                del plyr["source_team_key"]
-                if trader_tm:
+            for entry in extract.collection(
+                    extract.sub(transaction, 'players'), 'player'):
+                plyr_meta = extract.fields(entry)
+                plyr = {"player_id": plyr_meta["player_id"],
+                        "name": plyr_meta["name"]["full"],
+                        "position_type": plyr_meta["position_type"]}
+                data = extract.sub(entry, 'transaction_data')
+                if isinstance(data, list):
+                    data = data[0]
+                if data["source_team_key"] == tran["trader_team_key"]:
                     tran["trader_players"].append(plyr)
                 else:
                     tran["tradee_players"].append(plyr)
-
-            plyr_it = t.execute('''
-                $..transactions.'{}'..(player_id,full,position_type,
-                                      source_team_key)'''.format(i))
-            key_mapper = {"full": "name"}
-            plyr = {}
-            for elem in plyr_it:
-                for key, value in elem.items():
-                    if key in plyr:
-                        append_player(plyr)
-                        plyr = {}
-                    if key in key_mapper:
-                        plyr[key_mapper[key]] = value
-                    else:
-                        plyr[key] = value
-            append_player(plyr)
             trans.append(tran)
         return trans
 
@@ -396,7 +437,7 @@ class Team:
         :return: XML representation of the trade
         :rtype: str
         """
-        doc = Document()
+        doc = new_document()
         tran = doc.createElement('transaction')
         doc.appendChild(doc.createElement('fantasy_content')).appendChild(tran)
 
@@ -427,7 +468,7 @@ class Team:
         :return: XML representation of the trade proposal.
         :rtype: str
         """
-        doc = Document()
+        doc = new_document()
         transaction = doc.createElement('transaction')
         doc.appendChild(doc.createElement('fantasy_content')).appendChild(transaction)
 
@@ -465,7 +506,7 @@ class Team:
 
     def _construct_change_roster_xml(self, time_frame, modified_lineup):
         """Construct XML to pass to Yahoo! that will modified the positions"""
-        doc = Document()
+        doc = new_document()
         roster = doc.appendChild(doc.createElement('fantasy_content')) \
             .appendChild(doc.createElement('roster'))
 
@@ -494,7 +535,7 @@ class Team:
         return doc.toprettyxml()
 
     def _construct_transaction_xml(self, action, *player_ids, faab=None):
-        doc = Document()
+        doc = new_document()
         transaction = doc.appendChild(doc.createElement('fantasy_content')) \
             .appendChild(doc.createElement('transaction'))
 
@@ -102,6 +102,57 @@ class YHandler:
             with open(self.dir_path + "/sample.team_roster.json", "r") as f:
                 return json.load(f)
 
+    def get_leagues_by_keys_raw(self, league_keys, resources):
+        """Return the raw JSON when requesting several leagues at once.
+
+        Only the leagues and resources asked for are kept from the sample.
+
+        :param league_keys: List of league keys to fetch
+        :type league_keys: list[str]
+        :param resources: Sub-resources to include for each league
+        :type resources: list[str]
+        :return: JSON document of the request.
+        """
+        with open(self.dir_path + "/sample.leagues_bulk.json", "r") as f:
+            j = json.load(f)
+        lgs = j['fantasy_content']['leagues']
+        entries = []
+        for i in range(lgs['count']):
+            lg = lgs[str(i)]['league']
+            if lg[0]['league_key'] in league_keys:
+                entries.append({'league': [lg[0]] + [
+                    sub for sub in lg[1:] if list(sub)[0] in resources]})
+        j['fantasy_content']['leagues'] = {str(i): e
+                                           for i, e in enumerate(entries)}
+        j['fantasy_content']['leagues']['count'] = len(entries)
+        return j
+
+    def get_league_rosters_raw(self, league_id, week=None, day=None):
+        """Return the raw JSON when requesting the roster of every team
+
+        There is no recorded league/{id}/teams/roster response, so it is put
+        together from recorded ones: the teams of the standings sample, each
+        with the roster sub-resource of the team roster sample.
+
+        :param league_id: League ID to get the rosters for
+        :type league_id: str
+        :param week: What week number to request the rosters for?
+        :type week: int
+        :param day: What day number to request the rosters
+        :type day: datetime.date
+        :return: JSON of the request
+        """
+        j = self.get_standings_raw(league_id)
+        roster = self.get_roster_raw(None, week=week,
+                                     day=day)['fantasy_content']['team'][1]
+        lg = j['fantasy_content']['league']
+        teams = lg[1]['standings'][0]['teams']
+        lg[1] = {'teams': {str(i): {'team': [teams[str(i)]['team'][0],
+                                             roster]}
+                           for i in range(int(teams['count']))}}
+        lg[1]['teams']['count'] = teams['count']
+        return j
+
     def get_scoreboard_raw(self, league_id, week=None):
         """Return the raw JSON when requesting the scoreboard for a week
 
@@ -125,9 +176,12 @@ class YHandler:
             pg = "1"
         elif start == 25:
             pg = "2"
-        else:
-            assert(start == 50)
+        elif start == 50:
             pg = "3"
+        else:
+            # Past the last page Yahoo! returns an empty list of players
+            assert(start % 25 == 0)
+            return {'fantasy_content': {'league': [{}, {'players': []}]}}
         fn = self.dir_path + "/sample.players.freeagents.C.pg.{}.json"\
             .format(pg)
         with open(fn, "r") as f:
@@ -171,7 +225,7 @@ class YHandler:
         with open(fn, "r") as f:
             return json.load(f)
 
-    def get_player_raw(self, league_id, search=None, ids=None):
+    def get_player_raw(self, league_id, search=None, ids=None, stats=True):
         if search is not None:
             fn = "{}/sample.player_details.{}.json".format(self.dir_path,
                                                            search)
@@ -192,7 +246,7 @@ class YHandler:
         with open(self.dir_path + "/sample.game_details.json", "r") as f:
             return json.load(f)
 
-    def get_transactions_raw(self, league_id, tran_types, count):
+    def get_transactions_raw(self, league_id, tran_types, count, start=None):
         """Return the raw JSON when requesting transactions of a league.
         :param league_id: The league ID that the API request applies to
         :type league_id: str
@@ -202,10 +256,26 @@ class YHandler:
         :param count: The number of transactions to retrieve. Leave blank to return all
         transactions
         :type count str
+        :param start: Index of the first transaction to return
+        :type start: int
         :return: JSON document of the request.
         """
         with open(self.dir_path + "/sample.transactions.json", "r") as f:
-            return json.load(f)
+            j = json.load(f)
+        if start is None:
+            return j
+        # Return the page that was asked for
+        lg_trans = j['fantasy_content']['league'][1]['transactions']
+        page = [lg_trans[str(i)]
+                for i in range(lg_trans['count'])][start:start + int(count)]
+        if len(page) == 0:
+            j['fantasy_content']['league'][1]['transactions'] = []
+        else:
+            j['fantasy_content']['league'][1]['transactions'] = \
+                {str(i): t for i, t in enumerate(page)}
+            j['fantasy_content']['league'][1]['transactions']['count'] = \
+                len(page)
+        return j
 
     def put_roster(self, team_key, xml):
         # This produces no output. Just save the xml for inspection by the
@@ -221,3 +291,20 @@ class YHandler:
         """
         with open(self.dir_path + "/sample.team_details.json", "r") as f:
             return json.load(f)
+
+
+class AsyncYHandler:
+    """Asynchronous version of the mocking class
+
+    Each API returns an awaitable of the same pre-canned JSON response.
+    """
+
+    def __init__(self):
+        self.yhandler = YHandler()
+
+    def __getattr__(self, name):
+        method = getattr(self.yhandler, name)
+
+        async def wrapper(*args, **kwargs):
+            return method(*args, **kwargs)
+        return wrapper
@@ -0,0 +1,105 @@
+#!/bin/python
+
+import yahoo_fantasy_api as yfa
+from yahoo_fantasy_api import yhandler
+import mock_yhandler
+from unittest.mock import AsyncMock
+import asyncio
+import pytest
+
+
+@pytest.fixture()
+def async_mlb_league(sc):
+    yield yfa.AsyncLeague(sc, '370.l.56877',
+                          handler=mock_yhandler.AsyncYHandler())
+
+
+@pytest.fixture()
+def async_nhl_league(sc):
+    yield yfa.AsyncLeague(sc, '396.l.21484',
+                          handler=mock_yhandler.AsyncYHandler())
+
+
+def test_league_matches_sync(async_mlb_league, mock_mlb_league):
+    for name, args in [('standings', []), ('teams', []), ('settings', []),
+                       ('stat_categories', []), ('positions', []),
+                       ('edit_date', []), ('team_key', []),
+                       ('current_week', []), ('end_week', []),
+                       ('week_date_range', [13]), ('free_agents', ['C']),
+                       ('rosters', [3]), ('pending_trades', []),
+                       ('percent_owned', [[3737, 6381]]),
+                       ('ownership', [[9265]]),
+                       ('player_stats', [[7345], 'season']),
+                       ('transactions', ['trade', '1'])]:
+        exp = getattr(mock_mlb_league, name)(*args)
+        res = asyncio.run(getattr(async_mlb_league, name)(*args))
+        assert res == exp, name
+
+
+def test_league_player_details(async_nhl_league, mock_nhl_league):
+    for p in ["Phil", [3983, 5085, 5387], 5387]:
+        exp = mock_nhl_league.player_details(p)
+        assert asyncio.run(async_nhl_league.player_details(p)) == exp
+    exp = mock_nhl_league.draft_results()
+    assert asyncio.run(async_nhl_league.draft_results()) == exp
+
+
+def test_team_matches_sync(async_mlb_league, mock_team):
+    tm = async_mlb_league.to_team(mock_team.team_key)
+    assert isinstance(tm, yfa.AsyncTeam)
+    assert asyncio.run(tm.roster(3)) == mock_team.roster(3)
+    assert asyncio.run(tm.details()) == mock_team.details()
+    assert asyncio.run(tm.proposed_trades()) == mock_team.proposed_trades()
+
+
+def test_game(sc):
+    gm = yfa.AsyncGame(sc, 'nhl', handler=mock_yhandler.AsyncYHandler())
+    assert asyncio.run(gm.game_id()) == '396'
+    assert isinstance(gm.to_league('396.l.21484'), yfa.AsyncLeague)
+    lgs = asyncio.run(gm.leagues_bulk(['388.l.27081', '396.l.21484']))
+    assert isinstance(lgs['396.l.21484'], yfa.AsyncLeague)
+    assert asyncio.run(lgs['388.l.27081'].current_week()) == 12
+
+
+def test_async_yhandler_uri():
+    yh = yhandler.AsyncYHandler('dummy-sc')
+    yh.get = AsyncMock(return_value={'data': 'success'})
+    assert asyncio.run(yh.get_standings_raw('388.l.27081')) == \
+        {'data': 'success'}
+    yh.get.assert_awaited_with("league/388.l.27081/standings")
+
+
+def test_league_sync_transactions(sc):
+    lg = yfa.AsyncLeague(sc, '399.l.710921',
+                         handler=mock_yhandler.AsyncYHandler())
+    cursor = yfa.league.TransactionCursor()
+
+    async def sync():
+        return [t['transaction_id'] async for t in
+                lg.sync_transactions(cursor, 'trade', page_size=2)]
+    assert asyncio.run(sync()) == ['133', '295', '319']
+    assert asyncio.run(sync()) == []
+
+
+def test_league_iter_free_agents(async_mlb_league, mock_mlb_league):
+    async def first_three():
+        plyrs = []
+        async for p in async_mlb_league.iter_free_agents('C'):
+            plyrs.append(p)
+            if len(plyrs) == 3:
+                break
+        return plyrs
+    assert asyncio.run(first_three()) == mock_mlb_league.free_agents('C')[0:3]
+
+
+def test_async_objects_share_one_handler():
+    import types
+    sc = types.SimpleNamespace()
+    gm = yfa.AsyncGame(sc, 'nhl')
+    lg = gm.to_league('396.l.21484')
+    tm = yfa.AsyncTeam(sc, '396.l.21484.t.2')
+    assert isinstance(gm.yhandler, yhandler.AsyncYHandler)
+    assert lg.yhandler is gm.yhandler
+    assert tm.yhandler is gm.yhandler
+    assert yfa.AsyncLeague(sc, '396.l.21484').yhandler is gm.yhandler
+    assert not hasattr(sc, '_yfa_handler')
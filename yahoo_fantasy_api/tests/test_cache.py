@@ -0,0 +1,234 @@
+#!/bin/python
+
+from yahoo_fantasy_api import cache, yhandler
+from unittest.mock import Mock
+import json
+import os
+
+
+DIR_PATH = os.path.dirname(os.path.realpath(__file__))
+
+
+def load(fn):
+    with open(os.path.join(DIR_PATH, fn), "r") as f:
+        return json.load(f)
+
+
+def test_policy_resources():
+    policy = cache.CachePolicy()
+    assert policy.resource('game/nfl') == 'game'
+    assert policy.resource('league/388.l.27081/settings') == 'settings'
+    assert policy.resource('league/388.l.27081/scoreboard;week=3') == \
+        'scoreboard'
+    assert policy.resource('users;use_login=1/games/teams') is None
+    assert not policy.cacheable('team/388.l.27081.t.5/roster')
+
+
+def test_policy_immutable():
+    policy = cache.CachePolicy()
+    sb = load('sample.scoreboard.week12.json')
+    # Week 12 is the current week, so it can still change
+    assert policy.ttl('league/370.l.56877/scoreboard;week=12', sb) == \
+        cache.MINUTE
+    assert policy.ttl('league/370.l.56877/scoreboard;week=11', sb) == \
+        cache.IMMUTABLE
+    dr = load('sample.draftresults.396.l.21484.json')
+    assert policy.ttl('league/396.l.21484/draftresults', dr) == \
+        cache.IMMUTABLE
+    sb['fantasy_content']['league'][0]['is_finished'] = 1
+    assert policy.ttl('league/370.l.56877/scoreboard', sb) == cache.IMMUTABLE
+
+
+def test_policy_ttl_override():
+    policy = cache.CachePolicy(ttls={'settings': None, 'transactions': 30})
+    assert not policy.cacheable('league/388.l.27081/settings')
+    assert policy.ttl('game/nfl', {}) == cache.DAY
+
+
+def test_memory_cache_lru_and_expiry():
+    now = [0.0]
+    mc = cache.MemoryCache(max_bytes=10, clock=lambda: now[0])
+    mc.set('a', b'1234', 5)
+    mc.set('b', b'1234', cache.IMMUTABLE)
+    assert mc.get('a') == b'1234'
+    # 'b' is the least recently used, so it goes first
+    mc.set('c', b'1234', 5)
+    assert mc.get('b') is None
+    assert mc.get('a') == b'1234'
+    now[0] = 6.0
+    assert mc.get('a') is None
+
+
+def test_sqlite_cache_persists(tmp_path):
+    fn = str(tmp_path / 'responses.db')
+    now = [0.0]
+    sc = cache.SQLiteCache(fn, clock=lambda: now[0])
+    sc.set('game/nfl', b'{"a": 1}', 10)
+    sc.set('league/1/scoreboard;week=1', b'{"b": 2}', cache.IMMUTABLE)
+    sc.close()
+
+    sc = cache.SQLiteCache(fn, clock=lambda: now[0])
+    assert sc.get('game/nfl') == b'{"a": 1}'
+    now[0] = 1000.0
+    assert sc.get('game/nfl') is None
+    assert sc.get('league/1/scoreboard;week=1') == b'{"b": 2}'
+
+
+def test_sqlite_cache_eviction(tmp_path):
+    now = [0.0]
+    sc = cache.SQLiteCache(str(tmp_path / 'r.db'), max_bytes=8,
+                           clock=lambda: now[0])
+    sc.set('a', b'1234', cache.IMMUTABLE)
+    now[0] = 1.0
+    sc.set('b', b'1234', cache.IMMUTABLE)
+    now[0] = 2.0
+    sc.get('a')
+    now[0] = 3.0
+    sc.set('c', b'1234', cache.IMMUTABLE)
+    assert sc.get('b') is None
+    assert sc.get('a') == b'1234'
+    assert sc.get('c') == b'1234'
+
+
+def test_yhandler_serves_from_cache():
+    doc = load('sample.game_details.json')
+    mock_sc = Mock()
+    response = Mock(status_code=200, content=json.dumps(doc).encode())
+    response.json = Mock(return_value=doc)
+    mock_sc.session.get = Mock(return_value=response)
+
+    yh = yhandler.YHandler(mock_sc, cache=cache.MemoryCache())
+    assert yh.get_game_raw('nhl') == doc
+    assert yh.get_game_raw('nhl') == doc
+    assert mock_sc.session.get.call_count == 1
+    # Resources without a TTL always go to Yahoo!
+    yh.get_teams_raw()
+    yh.get_teams_raw()
+    assert mock_sc.session.get.call_count == 3
+
+
+def test_yhandler_cache_is_per_login():
+    doc = load('sample.game_details.json')
+    shared = cache.MemoryCache()
+    handlers = []
+    for refresh_token in ['token-a', 'token-b', 'token-a']:
+        mock_sc = Mock(consumer_key='key', refresh_token=refresh_token)
+        response = Mock(status_code=200, content=json.dumps(doc).encode())
+        mock_sc.session.get = Mock(return_value=response)
+        handlers.append(yhandler.YHandler(mock_sc, cache=shared))
+    for yh in handlers:
+        yh.get_game_raw('nhl')
+    # The second login doesn't get the first login's response, but another
+    # handler for the first login does.
+    assert [yh.sc.session.get.call_count for yh in handlers] == [1, 1, 0]
+    assert handlers[0].cache_identity == handlers[2].cache_identity
+    assert yhandler.login_identity(Mock(spec=[])) is None
+
+
+def test_player_store_lru():
+    store = cache.PlayerStore()
+    data = [{'player_key': '396.p.1'}, {'player_id': '1'},
+            {'name': {'full': 'One'}}, [], {'is_keeper': {'status': False}}]
+    assert store.add('396', data) == 1
+    meta = store.get('396', 1)
+    assert meta['name']['full'] == 'One'
+    assert 'is_keeper' not in meta
+    assert store.get(396, '1') is meta
+    assert store.get('399', 1) is None
+    assert store.add('396', [{'player_key': '396.p.2'}]) is None
+
+    # Cap the store to two players
+    store = cache.PlayerStore(max_entries=2)
+    for i in range(1, 4):
+        store.add('396', [{'player_key': '396.p.{}'.format(i)},
+                          {'player_id': str(i)}, {'name': {'full': 'One'}}])
+        if i == 2:
+            store.get('396', 1)
+    assert len(store) == 2
+    assert store.get('396', 2) is None
+    assert store.get('396', 1) is not None
+    assert store.get('396', 3) is not None
+
+
+def test_ttl_cache_expiry_and_limits():
+    now = [0.0]
+    c = cache.TTLCache(ttl=60, max_entries=2, clock=lambda: now[0])
+    c['a'] = [1]
+    c['b'] = None
+    assert 'b' in c
+    assert c['b'] is None
+    assert c.get('a') == [1]
+    c['c'] = [3]
+    # b was the least recently used
+    assert c.keys() == ['a', 'c']
+    now[0] = 61
+    assert 'a' not in c
+    assert len(c) == 0
+
+    c = cache.TTLCache(max_bytes=10)
+    c['a'] = 'x' * 5
+    c['b'] = 'y' * 5
+    assert c.keys() == ['b']
+
+
+def test_ttl_cache_drops_expired_before_live():
+    now = [0.0]
+    c = cache.TTLCache(ttl=60, max_entries=2, clock=lambda: now[0])
+    c['a'] = 1
+    now[0] = 30
+    c['b'] = 2
+    c.get('a')
+    now[0] = 61
+    c['c'] = 3
+    # a expired, so it is dropped rather than the least recently used b
+    assert c.entries.keys() == {'b', 'c'}
+
+
+def test_league_cache_policy_default_caps():
+    policy = cache.LeagueCachePolicy()
+    assert policy.new_cache('player_details').max_entries == \
+        cache.LeagueCachePolicy.DEFAULT_MAX_ENTRIES
+    assert cache.LeagueCachePolicy(max_entries=None).new_cache(
+        'player_details').max_entries is None
+
+
+def test_league_registry_is_pruned():
+    class League:
+        def invalidate(self, kind):
+            pass
+
+    # Each League is gone as soon as it is registered
+    for i in range(1000):
+        cache.register_league('1.l.{}'.format(i), League())
+    gone = [k for k in cache._leagues if k.startswith('1.l.')]
+    assert len(gone) <= cache._leagues_prune_at
+    assert len(gone) < 1000
+    lg = League()
+    cache.register_league('1.l.live', lg)
+    cache.invalidate_league(gone[-1])
+    assert gone[-1] not in cache._leagues
+    assert '1.l.live' in cache._leagues
+
+
+def test_league_cache_policy_invalidate():
+    policy = cache.LeagueCachePolicy(ttls={'free_agents': 30},
+                                     max_entries=5)
+    assert policy.ttls['free_agents'] == 30
+    assert policy.ttls['week_date_range'] == cache.IMMUTABLE
+    fa1 = policy.new_cache('free_agents')
+    fa2 = policy.new_cache('free_agents')
+    dr = policy.new_cache('week_date_range')
+    assert fa1.max_entries == 5
+    fa1['C'] = [1]
+    fa2['C'] = [2]
+    dr[1] = (1, 2)
+    policy.invalidate('free_agents')
+    assert len(fa1) == 0 and len(fa2) == 0
+    assert dr[1] == (1, 2)
+    policy.invalidate()
+    assert len(dr) == 0
+    try:
+        policy.invalidate('scoreboard')
+        assert False, "Should have raised ValueError"
+    except ValueError:
+        pass
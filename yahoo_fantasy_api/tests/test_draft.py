@@ -0,0 +1,93 @@
+#!/bin/python
+
+import yahoo_fantasy_api as yfa
+import mock_yhandler
+from unittest.mock import MagicMock
+import asyncio
+import copy
+
+
+def draft_in_progress(made, keepers=(), status='draft'):
+    """Return the sample draft results with only some of the picks made"""
+    j = mock_yhandler.YHandler().get_draftresults_raw('396.l.21484')
+    lg = j['fantasy_content']['league']
+    lg[0]['draft_status'] = status
+    results = lg[1]['draft_results']
+    for i in range(results['count']):
+        if i >= made and i not in keepers:
+            del results[str(i)]['draft_result']['player_key']
+    return j
+
+
+def test_draft_tracker_reports_new_picks(mock_nhl_league):
+    now = [0.0]
+    docs = [draft_in_progress(0, status='predraft'),
+            draft_in_progress(3, keepers=[50]),
+            draft_in_progress(3, keepers=[50]),
+            draft_in_progress(10, keepers=[50])]
+    mock_nhl_league.yhandler.get_draftresults_raw = MagicMock(
+        side_effect=lambda lg_id: copy.deepcopy(docs.pop(0)))
+    tracker = yfa.DraftTracker(mock_nhl_league, min_interval=1,
+                               max_interval=30, clock=lambda: now[0])
+
+    assert(tracker.poll() == [])
+    assert(tracker.interval == 30)
+
+    picks = tracker.poll()
+    assert([p['pick'] for p in picks] == [1, 2, 3, 51])
+    assert(picks[0] == {'pick': 1, 'round': 1,
+                        'team_key': '396.l.49770.t.6', 'player_id': 5425})
+
+    now[0] = 10.0
+    assert(tracker.poll() == [])
+    assert(tracker.interval == 1.5)
+
+    now[0] = 24.0
+    picks = tracker.poll()
+    assert([p['pick'] for p in picks] == [4, 5, 6, 7, 8, 9, 10])
+    # 7 picks in 24 seconds: poll about twice per pick
+    assert(tracker.interval == (24.0 / 7) / 2)
+
+    assert(len(tracker.picks) == 11)
+    assert([p['pick'] for p in tracker.by_round[1]] == [1, 2, 3, 4, 5, 6])
+    assert(tracker.by_player[5425]['pick'] == 1)
+    assert(all(p['team_key'] == '396.l.49770.t.6'
+               for p in tracker.by_team['396.l.49770.t.6']))
+    assert(not tracker.is_done())
+
+
+def test_draft_tracker_follow(mock_nhl_league):
+    exp = mock_nhl_league.draft_results()
+    sleeps = []
+    docs = [draft_in_progress(40), draft_in_progress(84, status='postdraft')]
+    mock_nhl_league.yhandler.get_draftresults_raw = MagicMock(
+        side_effect=lambda lg_id: docs.pop(0))
+    tracker = yfa.DraftTracker(mock_nhl_league, sleep=sleeps.append)
+    picks = list(tracker.follow())
+    assert(len(picks) == 84)
+    assert(picks == exp)
+    assert(len(sleeps) == 1)
+    assert(tracker.is_done())
+
+
+def test_async_draft_tracker(sc):
+    lg = yfa.AsyncLeague(sc, '396.l.21484',
+                         handler=mock_yhandler.AsyncYHandler())
+    tracker = yfa.AsyncDraftTracker(lg)
+
+    async def follow():
+        return [p async for p in tracker.follow()]
+    assert(len(asyncio.run(follow())) == 84)
+
+
+def test_draft_tracker_skips_revalidated_board(mock_nhl_league):
+    doc = draft_in_progress(3)
+    mock_nhl_league.yhandler.get_draftresults_raw = MagicMock(
+        return_value=doc)
+    tracker = yfa.DraftTracker(mock_nhl_league, min_interval=1,
+                               max_interval=30, clock=lambda: 0.0)
+    assert(len(tracker.poll()) == 3)
+    # Wipe the board: a revalidated document must not be walked again
+    doc['fantasy_content']['league'][1]['draft_results'] = None
+    assert(tracker.poll() == [])
+    assert(tracker.interval == 1.5)
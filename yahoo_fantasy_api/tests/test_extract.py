@@ -0,0 +1,38 @@
+#!/bin/python
+
+from yahoo_fantasy_api import extract
+
+
+def test_collection():
+    coll = {'0': {'team': ['a']}, '1': {'team': ['b']}, 'count': 2}
+    assert(list(extract.collection(coll, 'team')) == [['a'], ['b']])
+    # Yahoo! sends an empty collection as an empty list
+    assert(list(extract.collection([], 'team')) == [])
+    assert(list(extract.collection(None, 'team')) == [])
+
+
+def test_fields():
+    team = [[{'team_key': '388.l.27081.t.5'}, [], {'name': 'Lumber Kings'}],
+            {'roster': {}}]
+    assert(extract.fields(team) == {'team_key': '388.l.27081.t.5',
+                                    'name': 'Lumber Kings'})
+    league = [{'league_key': '388.l.27081'}, {'settings': []}]
+    assert(extract.fields(league) == {'league_key': '388.l.27081'})
+    assert(extract.fields({'team_key': 'auto'}) == {'team_key': 'auto'})
+
+
+def test_sub():
+    player = [[{'player_id': '4472'}],
+              {'transaction_data': [{'type': 'pending_trade'}]}]
+    assert(extract.sub(player, 'transaction_data') ==
+           [{'type': 'pending_trade'}])
+    assert(extract.sub(player, 'player_stats') is None)
+    assert(extract.sub(player, 'player_stats', {}) == {})
+
+
+def test_path_and_player_id():
+    doc = {'fantasy_content': {'league': [{'current_week': 12}]}}
+    assert(extract.path('fantasy_content', 'league', 0)(doc) ==
+           {'current_week': 12})
+    assert(extract.league(doc)[0]['current_week'] == 12)
+    assert(extract.player_id('396.p.5425') == 5425)
@@ -2,6 +2,8 @@
 
 import yahoo_fantasy_api as yfa
 import mock_yhandler
+from unittest.mock import MagicMock
+import pytest
 
 
 def test_ids(sc):
@@ -34,3 +36,42 @@ def test_game_id(sc):
     gm = yfa.Game(sc, 'nhl')
     gm.inject_yhandler(mock_yhandler.YHandler())
     assert(gm.game_id() == '396')
+
+
+def test_leagues_bulk(sc):
+    gm = yfa.Game(sc, 'mlb')
+    gm.inject_yhandler(mock_yhandler.YHandler())
+    lgs = gm.leagues_bulk(['388.l.27081', '396.l.21484'])
+    assert(list(lgs.keys()) == ['388.l.27081', '396.l.21484'])
+    lg = lgs['388.l.27081']
+    # Everything was loaded from the bulk request, so nothing is refetched
+    lg.inject_yhandler(None)
+    assert(lg.settings()['name'] == "Buck you're next!")
+    assert(len(lg.stat_categories()) == 12)
+    assert(lg.standings()[0]['name'] == "Lumber Kings")
+    assert(lg.current_week() == 12)
+    assert(lg.end_week() == 24)
+    assert(lgs['396.l.21484'].settings()['game_code'] == 'nhl')
+
+
+def test_leagues_bulk_chunks_requests(sc):
+    gm = yfa.Game(sc, 'mlb')
+    yh = mock_yhandler.YHandler()
+    yh.get_leagues_by_keys_raw = MagicMock(
+        side_effect=mock_yhandler.YHandler().get_leagues_by_keys_raw)
+    gm.inject_yhandler(yh)
+    gm.LEAGUES_PER_REQUEST = 1
+    lgs = gm.leagues_bulk(['388.l.27081', '396.l.21484'],
+                          resources=['settings'])
+    assert(len(lgs) == 2)
+    assert(yh.get_leagues_by_keys_raw.call_count == 2)
+    yh.get_leagues_by_keys_raw.assert_called_with(['396.l.21484'],
+                                                  ['settings'])
+    assert(lgs['388.l.27081'].standings_cache.get('S') is None)
+
+
+def test_leagues_bulk_rejects_unknown_resource(sc):
+    gm = yfa.Game(sc, 'mlb')
+    gm.inject_yhandler(mock_yhandler.YHandler())
+    with pytest.raises(ValueError):
+        gm.leagues_bulk(['388.l.27081'], resources=['draftresults'])
@@ -0,0 +1,42 @@
+#!/bin/python
+
+import yahoo_fantasy_api as yfa
+from yahoo_fantasy_api import league
+import os
+import subprocess
+import sys
+
+# Modules that must not be loaded just by importing the package or YHandler
+HEAVY_MODULES = ['objectpath', 'yahoo_oauth', 'asyncio', 'sqlite3',
+                 'xml.dom.minidom', 'email.utils', 'aiohttp',
+                 'yahoo_fantasy_api.game', 'yahoo_fantasy_api.league',
+                 'yahoo_fantasy_api.team', 'yahoo_fantasy_api.aio']
+
+
+def loaded_after(stmt):
+    """Return the heavy modules loaded by running stmt in a new interpreter"""
+    root = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                        '..', '..')
+    code = "import sys\n{}\nprint(' '.join(m for m in {!r} " \
+        "if m in sys.modules))".format(stmt, HEAVY_MODULES)
+    out = subprocess.run([sys.executable, '-c', code], cwd=root, check=True,
+                         stdout=subprocess.PIPE, universal_newlines=True)
+    return out.stdout.split()
+
+
+def test_package_import_is_lazy():
+    assert(loaded_after('import yahoo_fantasy_api') == [])
+
+
+def test_yhandler_import_is_light():
+    assert(loaded_after('from yahoo_fantasy_api import YHandler') == [])
+
+
+def test_lazy_exports():
+    assert(yfa.League is league.League)
+    assert('AsyncTeam' in dir(yfa))
+    try:
+        yfa.NoSuchClass
+        assert(False), "expected an AttributeError"
+    except AttributeError:
+        pass
@@ -2,6 +2,8 @@
 
 from yahoo_fantasy_api.tests.conftest import mock_mlb_league
 import yahoo_fantasy_api as yfa
+import mock_yhandler
+from unittest.mock import MagicMock
 import datetime
 import pytest
 
@@ -36,6 +38,28 @@ def test_stat_categories(mock_mlb_league):
     assert(s[11]['position_type'] == 'P')
 
 
+def test_settings_fetched_once(sc):
+    yh = mock_yhandler.YHandler()
+    yh.get_settings_raw = MagicMock(wraps=yh.get_settings_raw)
+    lg = yfa.League(sc, '370.l.56877', handler=yh)
+    lg.settings()
+    lg.stat_categories()
+    lg.positions()
+    lg.edit_date()
+    lg.player_stats([7345], 'season')
+    assert(yh.get_settings_raw.call_count == 1)
+
+
+def test_lazy_construction(sc):
+    yh = MagicMock(wraps=mock_yhandler.YHandler())
+    lg = yfa.League(sc, '370.l.56877', handler=yh)
+    assert(yh.method_calls == [])
+    assert(lg.stats_id_map is None)
+    lg.prefetch()
+    assert(yh.get_settings_raw.call_count == 1)
+    assert(lg.stats_id_map[7] == 'R')
+
+
 def test_to_team(mock_mlb_league):
     tm = mock_mlb_league.to_team('370.l.56877.t.5')
     assert(isinstance(tm, yfa.Team))
@@ -81,6 +105,32 @@ def test_week_date_range_of_last(mock_mlb_league):
         (sdt, edt) = mock_mlb_league.week_date_range(23)
 
 
+def test_week_date_range_without_matchups(sc):
+    yh = mock_yhandler.YHandler()
+    json = yh.get_scoreboard_raw('370.l.56877', 12)
+    json['fantasy_content']['league'][1]['scoreboard']['0']['matchups'] = {}
+    yh.get_scoreboard_raw = MagicMock(return_value=json)
+    lg = yfa.League(sc, '370.l.56877', handler=yh)
+    with pytest.raises(RuntimeError):
+        lg.week_date_range(12)
+    assert(12 not in lg.week_date_range_cache)
+
+
+def test_scoreboard_shared(sc):
+    yh = mock_yhandler.YHandler()
+    yh.get_scoreboard_raw = MagicMock(wraps=yh.get_scoreboard_raw)
+    lg = yfa.League(sc, '370.l.56877', handler=yh)
+    assert(lg.current_week() == 12)
+    assert(lg.end_week() == 24)
+    assert(lg.week_date_range(12)[0] == datetime.date(2019, 6, 17))
+    assert(lg.matchups() == lg.matchups(12))
+    assert(yh.get_scoreboard_raw.call_count == 1)
+    # The current week is refetched once the snapshot goes stale
+    lg.scoreboard_cache[None].fetched -= lg.SCOREBOARD_TTL + 1
+    lg.current_week()
+    assert(yh.get_scoreboard_raw.call_count == 2)
+
+
 def test_team_list(mock_mlb_league):
     tms = mock_mlb_league.teams()
     assert(len(tms) == 10)
@@ -90,6 +140,32 @@ def test_team_list(mock_mlb_league):
     assert(tms['370.l.56877.t.9']['number_of_moves'] == '30')
 
 
+def test_standings_and_teams_share_fetch(sc):
+    yh = mock_yhandler.YHandler()
+    yh.get_standings_raw = MagicMock(wraps=yh.get_standings_raw)
+    lg = yfa.League(sc, '370.l.56877', handler=yh)
+    s = lg.standings()
+    tms = lg.teams()
+    assert(yh.get_standings_raw.call_count == 1)
+    assert([t['team_key'] for t in s] == list(tms.keys()))
+
+
+def test_standings_expire(sc):
+    yh = mock_yhandler.YHandler()
+    yh.get_standings_raw = MagicMock(wraps=yh.get_standings_raw)
+    policy = yfa.cache.LeagueCachePolicy(ttls={'standings': 0})
+    lg = yfa.League(sc, '370.l.56877', handler=yh, cache_policy=policy)
+    lg.standings()
+    lg.teams()
+    assert(yh.get_standings_raw.call_count == 2)
+
+    lg = yfa.League(sc, '370.l.56877', handler=yh)
+    lg.standings()
+    lg.invalidate('standings')
+    lg.standings()
+    assert(yh.get_standings_raw.call_count == 4)
+
+
 def test_free_agents(mock_mlb_league):
     fa = mock_mlb_league.free_agents('C')
     print(fa)
@@ -108,6 +184,50 @@ def test_free_agents(mock_mlb_league):
     assert(fa[21]['eligible_positions'] == ['C', 'LW'])
 
 
+def test_free_agents_parallel(sc, mock_mlb_league):
+    yh = mock_yhandler.YHandler()
+    yh.get_players_raw = MagicMock(wraps=yh.get_players_raw)
+    lg = yfa.League(sc, '370.l.56877', handler=yh, max_workers=2)
+    fa = lg.free_agents('C')
+    assert(fa == mock_mlb_league.free_agents('C'))
+    # Pages are requested in a window of two, so at most one page past the
+    # short page is requested.  It may be cancelled before it is sent.
+    starts = sorted(c[0][1] for c in yh.get_players_raw.call_args_list)
+    assert(starts[0:3] == [0, 25, 50])
+    assert(set(starts) <= set([0, 25, 50, 75]))
+
+
+def test_iter_free_agents_stops_early(sc, mock_mlb_league):
+    import itertools
+    yh = mock_yhandler.YHandler()
+    yh.get_players_raw = MagicMock(wraps=yh.get_players_raw)
+    lg = yfa.League(sc, '370.l.56877', handler=yh)
+    it = lg.iter_free_agents('C')
+    first = next(it)
+    assert(first == mock_mlb_league.free_agents('C')[0])
+    assert(yh.get_players_raw.call_count == 1)
+    rest = list(itertools.islice(it, 9))
+    assert(len(rest) == 9)
+    assert(yh.get_players_raw.call_count == 1)
+    it.close()
+    assert(list(lg.iter_free_agents('C')) == mock_mlb_league.free_agents('C'))
+    # Streaming doesn't fill the free agent cache
+    assert(len(lg.free_agent_cache) == 0)
+
+
+def test_iter_free_agents_parallel(sc, mock_mlb_league):
+    yh = mock_yhandler.YHandler()
+    yh.get_players_raw = MagicMock(wraps=yh.get_players_raw)
+    lg = yfa.League(sc, '370.l.56877', handler=yh, max_workers=2)
+    it = lg.iter_free_agents('C')
+    assert(next(it) == mock_mlb_league.free_agents('C')[0])
+    it.close()
+    # Only the first window of pages and the one scheduled after the first
+    # page was consumed can have been requested.
+    starts = sorted(c[0][1] for c in yh.get_players_raw.call_args_list)
+    assert(set(starts) <= set([0, 25, 50]))
+
+
 def test_pct_own_in_free_agents(mock_mlb_league):
     fa = mock_mlb_league.free_agents('C')
     print(fa)
@@ -123,12 +243,12 @@ def test_pct_own_in_free_agents(mock_mlb_league):
 def test_percent_owned(mock_mlb_league):
     po = mock_mlb_league.percent_owned([3737, 6381, 4003, 3705])
     assert(len(po) == 4)
-    assert(po[0]['player_id'] == 3737)
-    assert(po[0]['name'] == 'Sidney Crosby')
-    assert(po[0]['percent_owned'] == 100)
-    assert(po[1]['player_id'] == 6381)
-    assert(po[1]['name'] == 'Dylan Larkin')
-    assert(po[1]['percent_owned'] == 89)
+    assert(po['3737']['player_id'] == 3737)
+    assert(po['3737']['name'] == 'Sidney Crosby')
+    assert(po['3737']['percent_owned'] == 100)
+    assert(po['6381']['player_id'] == 6381)
+    assert(po['6381']['name'] == 'Dylan Larkin')
+    assert(po['6381']['percent_owned'] == 89)
 
 
 def test_ownership(mock_mlb_league):
@@ -137,6 +257,36 @@ def test_ownership(mock_mlb_league):
     assert(details['27564']['ownership_type'] == "freeagents")
 
 
+def test_percent_owned_batches(sc):
+    yh = mock_yhandler.YHandler()
+    yh.get_percent_owned_raw = MagicMock(wraps=yh.get_percent_owned_raw)
+    yh.get_player_ownership_raw = MagicMock(
+        wraps=yh.get_player_ownership_raw)
+    lg = yfa.League(sc, '396.l.21484', handler=yh, max_workers=4)
+    ids = list(range(60))
+    po = lg.percent_owned(ids)
+    assert(sorted(po.keys()) == ['3705', '3737', '4003', '6381'])
+    chunks = sorted(c[0][1] for c in yh.get_percent_owned_raw.call_args_list)
+    assert(chunks == [ids[0:25], ids[25:50], ids[50:60]])
+    details = lg.ownership(ids)
+    assert(len(details) == 2)
+    assert(yh.get_player_ownership_raw.call_count == 3)
+
+
+def test_percent_owned_missing_fields(mock_mlb_league):
+    json = mock_mlb_league.yhandler.get_percent_owned_raw(
+        mock_mlb_league.league_id, [3737])
+    players = json['fantasy_content']['league'][1]['players']
+    # Drop the percent owned of the first player and reorder the fields of
+    # the second.
+    players['0']['player'] = players['0']['player'][0:1]
+    players['1']['player'][0].reverse()
+    po = mock_mlb_league._percent_owned_from_json(json)
+    assert(po['3737']['percent_owned'] == 0)
+    assert(po['6381']['name'] == 'Dylan Larkin')
+    assert(po['6381']['percent_owned'] == 89)
+
+
 def test_edit_date(mock_mlb_league):
     dt = mock_mlb_league.edit_date()
     assert(isinstance(dt, datetime.date))
@@ -163,6 +313,18 @@ def test_mlb_player_stats(mock_mlb_league):
     assert(stats[0]['HR'] == 10)
 
 
+def test_player_stats_parallel(sc):
+    yh = mock_yhandler.YHandler()
+    yh.get_player_stats_raw = MagicMock(wraps=yh.get_player_stats_raw)
+    lg = yfa.League(sc, '396.l.21484', handler=yh, max_workers=4)
+    ids = list(range(60))
+    stats = lg.player_stats(ids, 'season')
+    assert(len(stats) == 3)
+    assert(all(s['name'] == 'Claude Giroux' for s in stats))
+    chunks = sorted(c[0][1] for c in yh.get_player_stats_raw.call_args_list)
+    assert(chunks == [ids[0:25], ids[25:50], ids[50:60]])
+
+
 def test_nhl_player_stats(mock_nhl_league):
     stats = mock_nhl_league.player_stats([4002], 'season')
     print(stats)
@@ -222,6 +384,34 @@ def test_player_details_cache(mock_nhl_league):
     assert(list(mock_nhl_league.player_details_cache.keys()) == exp_keys)
 
 
+def test_player_metadata_shared_store(sc):
+    yh = mock_yhandler.YHandler()
+    yh.get_player_raw = MagicMock(wraps=yh.get_player_raw)
+    store = yfa.cache.PlayerStore()
+    lg1 = yfa.League(sc, '396.l.21484', handler=yh)
+    lg1.player_store = store
+    lg2 = yfa.League(sc, '396.l.128634', handler=yh)
+    lg2.player_store = store
+
+    md = lg1.player_metadata([3983, 5085])
+    assert([p['name']['full'] for p in md] == ['Phil Kessel',
+                                               'Philipp Grubauer'])
+    assert('player_stats' not in md[0])
+    yh.get_player_raw.assert_called_once_with('396.l.21484',
+                                              ids=[3983, 5085], stats=False)
+    # Another league of the same game is served from the store
+    md = lg2.player_metadata([5387, 3983])
+    assert([p['name']['full'] for p in md] == ['Phillip Danault',
+                                               'Phil Kessel'])
+    assert(yh.get_player_raw.call_count == 1)
+
+    # Players seen on a free agent page are in the store too
+    lg2.free_agents('C')
+    fa_id = lg2.free_agents('C')[0]['player_id']
+    assert(lg1.player_metadata([fa_id])[0]['player_id'] == str(fa_id))
+    assert(yh.get_player_raw.call_count == 1)
+
+
 def test_transactions(mock_mlb_league):
     transactions = mock_mlb_league.transactions("trade", "1")
     for transaction in transactions:
@@ -234,3 +424,128 @@ def test_get_team(mock_nhl_league):
     team = mock_nhl_league.get_team("LOS DIOSES")
     assert(team)
     assert(team["LOS DIOSES"].team_key == '418.l.15944.t.1')
+
+
+def test_rosters(mock_mlb_league):
+    r = mock_mlb_league.rosters(3)
+    assert(list(r.keys()) == list(mock_mlb_league.teams().keys()))
+    assert(all(k.startswith('370.l.56877.t.') for k in r))
+    # Each roster is parsed the same as Team.roster
+    for team_key in r:
+        tm = mock_mlb_league.to_team(team_key)
+        assert(r[team_key] == tm.roster(3))
+    assert(len(r['370.l.56877.t.1']) > 0)
+
+
+def test_free_agents_expire(sc):
+    yh = mock_yhandler.YHandler()
+    yh.get_players_raw = MagicMock(wraps=yh.get_players_raw)
+    policy = yfa.cache.LeagueCachePolicy(ttls={'free_agents': 0})
+    lg = yfa.League(sc, '396.l.21484', handler=yh, cache_policy=policy)
+    lg.free_agents('C')
+    calls = yh.get_players_raw.call_count
+    lg.free_agents('C')
+    assert(yh.get_players_raw.call_count == 2 * calls)
+
+
+def test_invalidate(mock_nhl_league):
+    mock_nhl_league.free_agents('C')
+    mock_nhl_league.player_details([3983])
+    mock_nhl_league.invalidate('free_agents')
+    assert(len(mock_nhl_league.free_agent_cache) == 0)
+    assert(len(mock_nhl_league.player_details_cache) > 0)
+    mock_nhl_league.invalidate()
+    assert(len(mock_nhl_league.player_details_cache) == 0)
+    with pytest.raises(ValueError):
+        mock_nhl_league.invalidate('scoreboard')
+
+
+def test_roster_move_invalidates_league(sc):
+    yh = mock_yhandler.YHandler()
+    yh.post_transactions = MagicMock()
+    lg = yfa.League(sc, '396.l.21484', handler=yh)
+    other = yfa.League(sc, '396.l.99999', handler=yh)
+    lg.free_agents('C')
+    lg.player_details([3983])
+    other.free_agents('C')
+    tm = lg.to_team('396.l.21484.t.1')
+    tm.drop_player(3983)
+    yh.post_transactions.assert_called_once()
+    assert(len(lg.free_agent_cache) == 0)
+    assert(3983 in lg.player_details_cache)
+    assert(len(other.free_agent_cache) == 1)
+
+
+def test_sync_transactions(sc, tmp_path):
+    yh = mock_yhandler.YHandler()
+    yh.get_transactions_raw = MagicMock(wraps=yh.get_transactions_raw)
+    lg = yfa.League(sc, '399.l.710921', handler=yh)
+    cursor = yfa.league.TransactionCursor()
+    ids = [t['transaction_id'] for t in
+           lg.sync_transactions(cursor, 'trade', page_size=2)]
+    # Everything is new the first time, generated oldest first
+    assert(ids == ['133', '295', '319'])
+    assert(yh.get_transactions_raw.call_count == 2)
+    yh.get_transactions_raw.assert_called_with('399.l.710921', 'trade', 2,
+                                               start=2)
+    assert(cursor.position('399.l.710921', 'trade') == 319)
+    assert(cursor.position('399.l.710921', 'add') is None)
+
+    # A restarted process loads the cursor and stops at the first page
+    path = str(tmp_path / 'cursor.json')
+    cursor.save(path)
+    cursor = yfa.league.TransactionCursor.load(path)
+    yh.get_transactions_raw.reset_mock()
+    assert(list(lg.sync_transactions(cursor, 'trade', page_size=2)) == [])
+    assert(yh.get_transactions_raw.call_count == 1)
+
+    # Only the transactions after the cursor are generated
+    cursor = yfa.league.TransactionCursor(
+        {'399.l.710921;types=trade': {'transaction_id': 133}})
+    gen = lg.sync_transactions(cursor, 'trade', page_size=2)
+    assert(next(gen)['transaction_id'] == '295')
+    # Not advanced until the caller asks for the next one
+    assert(cursor.position('399.l.710921', 'trade') == 133)
+    assert([t['transaction_id'] for t in gen] == ['319'])
+    assert(cursor.position('399.l.710921', 'trade') == 319)
+
+
+def test_sync_transactions_redelivers_on_error(sc):
+    lg = yfa.League(sc, '399.l.710921', handler=mock_yhandler.YHandler())
+    cursor = yfa.league.TransactionCursor()
+    with pytest.raises(RuntimeError):
+        for t in lg.sync_transactions(cursor, 'trade', page_size=2):
+            if t['transaction_id'] == '295':
+                raise RuntimeError("notify failed")
+    assert(cursor.position('399.l.710921', 'trade') == 133)
+    ids = [t['transaction_id'] for t in
+           lg.sync_transactions(cursor, 'trade', page_size=2)]
+    assert(ids == ['295', '319'])
+
+
+def test_transaction_cursor_load_missing(tmp_path):
+    cursor = yfa.league.TransactionCursor.load(str(tmp_path / 'none.json'))
+    assert(cursor.to_dict() == {})
+
+
+def test_get_team_with_quote(mock_mlb_league):
+    tm = mock_mlb_league.get_team("Pablo's Wonderful Team")
+    assert(list(tm.keys()) == ["Pablo's Wonderful Team"])
+    assert(tm["Pablo's Wonderful Team"].team_key.startswith('418.l.15944.t.'))
+    assert(mock_mlb_league.get_team('No such team') == {})
+
+
+def test_pending_trades(sc):
+    yh = mock_yhandler.YHandler()
+    yh.get_team_transactions = MagicMock(wraps=yh.get_team_transactions)
+    lg = yfa.League(sc, '396.l.21484', handler=yh, max_workers=4)
+    trades = lg.pending_trades()
+    team_keys = list(lg.teams().keys())
+    assert(list(trades.keys()) == team_keys)
+    # One request per team, each parsed the same as Team.proposed_trades
+    requested = [c[0][1] for c in yh.get_team_transactions.call_args_list]
+    assert(sorted(requested) == sorted(team_keys))
+    tm = lg.to_team(team_keys[0])
+    assert(trades[team_keys[0]] == tm.proposed_trades())
+    assert([t['transaction_key'] for t in trades[team_keys[0]]] ==
+           ['396.l.49770.pt.1', '396.l.49770.pt.2', '396.l.49770.pt.3'])
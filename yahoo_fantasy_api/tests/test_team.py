@@ -31,6 +31,15 @@ def test_roster(mock_team):
     assert(r[5]['selected_position'] == 'LF')
 
 
+def test_roster_fills_player_store(mock_team):
+    from yahoo_fantasy_api import cache
+    mock_team.player_store = cache.PlayerStore()
+    mock_team.roster(3)
+    assert(len(mock_team.player_store) == 22)
+    meta = mock_team.player_store.get(mock_team.league_prefix, 10592)
+    assert(meta['name']['full'] == 'Jack Flaherty')
+
+
 def test_roster_status(mock_team):
     r = mock_team.roster(3)
     print(r)
@@ -201,7 +201,7 @@ def test_get_with_token_refresh():
     # Second response: success after refresh.
     mock_success_response = Mock()
     mock_success_response.status_code = 200
-    mock_success_response.json = Mock(return_value={'data': 'success'})
+    mock_success_response.content = b'{"data": "success"}'
 
     # Initial session that returns expired response.
     mock_initial_session = Mock()
@@ -329,3 +329,451 @@ def test_post_with_token_refresh():
 
     # Verify result.
     assert result == mock_success_response
+
+
+# Transport tests.
+
+def test_get_uses_transport_settings():
+    """Test that get() mounts the pooled adapter and passes the timeouts."""
+    mock_sc = Mock()
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.content = b'{"data": "success"}'
+    mock_sc.session.get = Mock(return_value=mock_response)
+
+    transport = yhandler.Transport(pool_maxsize=20, connect_timeout=1.0,
+                                   read_timeout=2.0)
+    yh = yhandler.YHandler(mock_sc, transport=transport)
+    yh.get('test/endpoint')
+    yh.get('test/endpoint')
+
+    # The adapter is only mounted once per session.
+    mock_sc.session.mount.assert_called_once()
+    adapter = mock_sc.session.mount.call_args[0][1]
+    assert adapter._pool_maxsize == 20
+    kwargs = mock_sc.session.get.call_args[1]
+    assert kwargs['timeout'] == (1.0, 2.0)
+    assert 'gzip' in kwargs['headers']['Accept-Encoding']
+
+
+def test_get_without_compression():
+    mock_sc = Mock()
+    mock_response = Mock(status_code=200, content=b'{"data": "success"}')
+    mock_sc.session.get = Mock(return_value=mock_response)
+    yh = yhandler.YHandler(mock_sc,
+                           transport=yhandler.Transport(compress=False))
+    yh.get('test/endpoint')
+    kwargs = mock_sc.session.get.call_args[1]
+    assert kwargs['headers']['Accept-Encoding'] == 'identity'
+
+
+def test_get_handler_is_shared():
+    """Test that objects built from the same session share a handler."""
+    mock_sc = Mock()
+    assert yhandler.get_handler(mock_sc) is yhandler.get_handler(mock_sc)
+    assert yhandler.get_handler(mock_sc) is not yhandler.get_handler(Mock())
+
+
+def test_get_handler_with_options():
+    """Test that the shared handler can be configured for the session."""
+    import types
+    import yahoo_fantasy_api as yfa
+    sc = types.SimpleNamespace()
+    limiter = yhandler.RateLimiter(2)
+    yh = yhandler.get_handler(sc, rate_limiter=limiter)
+    assert yh.rate_limiter is limiter
+    assert yhandler.get_handler(sc) is yh
+    assert yfa.Game(sc, 'nhl').yhandler is yh
+    assert yfa.League(sc, '396.l.21484').yhandler is yh
+    assert yfa.Team(sc, '396.l.21484.t.2').yhandler is yh
+    other = yhandler.YHandler(sc)
+    assert yfa.Game(sc, 'nhl', handler=other).yhandler is other
+
+
+def test_get_handler_is_freed_with_session():
+    """Test that a shared handler doesn't keep its session context alive."""
+    import gc
+    import weakref
+
+    class SessionContext:
+        pass
+
+    sc = SessionContext()
+    ref = weakref.ref(sc)
+    yh = yhandler.get_handler(sc)
+    assert yhandler.get_handler(sc) is yh
+    del sc, yh
+    gc.collect()
+    assert ref() is None
+
+
+# Rate limiting and backoff tests.
+
+def test_rate_limiter_token_bucket():
+    """Test that the bucket allows a burst, then spaces out requests."""
+    now = [0.0]
+    rl = yhandler.RateLimiter(2, burst=2, clock=lambda: now[0])
+    assert rl.reserve() == 0.0
+    assert rl.reserve() == 0.0
+    assert rl.reserve() == 0.5
+    assert rl.reserve() == 1.0
+    now[0] = 10.0
+    assert rl.reserve() == 0.0
+
+
+def test_get_retries_throttled_response():
+    """Test that get() backs off on a 999 and honours Retry-After."""
+    mock_sc = Mock()
+    throttled = Mock(status_code=999, content=b'Request denied',
+                     headers={'Retry-After': '0'})
+    ok = Mock(status_code=200, headers={})
+    ok.content = b'{"data": "success"}'
+    mock_sc.session.get = Mock(side_effect=[throttled, throttled, ok])
+
+    yh = yhandler.YHandler(mock_sc)
+    with patch('time.sleep') as sleep:
+        assert yh.get('test/endpoint') == {'data': 'success'}
+    assert mock_sc.session.get.call_count == 3
+    sleep.assert_called_with(0.0)
+
+
+def test_get_gives_up_after_max_retries():
+    """Test that get() raises once the retries are exhausted."""
+    mock_sc = Mock()
+    failed = Mock(status_code=503, content=b'Unavailable', headers={})
+    mock_sc.session.get = Mock(return_value=failed)
+
+    retry = yhandler.RetryPolicy(max_retries=2, base_delay=0.0)
+    yh = yhandler.YHandler(mock_sc, retry=retry)
+    try:
+        yh.get('test/endpoint')
+        assert False, "Should have raised RuntimeError"
+    except RuntimeError as e:
+        assert e.args[0] == b'Unavailable'
+    assert mock_sc.session.get.call_count == 3
+
+
+def test_retry_policy_backoff_is_bounded():
+    """Test the jittered backoff stays within the exponential bound."""
+    retry = yhandler.RetryPolicy(base_delay=1.0, max_delay=5.0)
+    response = Mock(status_code=429, headers={})
+    for attempt in range(6):
+        assert 0 <= retry.delay(attempt, response) <= min(5.0, 2 ** attempt)
+    response.headers = {'Retry-After': '120'}
+    assert retry.delay(0, response) == 5.0
+
+
+# Request coalescing tests.
+
+def test_get_coalesces_concurrent_requests():
+    """Test that concurrent gets of one URI share a single request."""
+    import threading
+    import time
+
+    mock_sc = Mock()
+    response = Mock(status_code=200, headers={})
+    response.content = b'{"data": "success"}'
+
+    def slow_get(*args, **kwargs):
+        time.sleep(0.2)
+        return response
+    mock_sc.session.get = Mock(side_effect=slow_get)
+
+    yh = yhandler.YHandler(mock_sc)
+    results = []
+    threads = [threading.Thread(
+        target=lambda: results.append(yh.get('test/endpoint')))
+        for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert mock_sc.session.get.call_count == 1
+    assert len(results) == 5
+    assert all(r is results[0] for r in results)
+    # Once the request is done the next get goes to the network again.
+    yh.get('test/endpoint')
+    assert mock_sc.session.get.call_count == 2
+
+
+def test_get_clears_inflight_request_on_error():
+    """Test that a failed request doesn't stay registered as in flight."""
+    mock_sc = Mock()
+    failed = Mock(status_code=400, content=b'Bad request', headers={})
+    mock_sc.session.get = Mock(return_value=failed)
+    yh = yhandler.YHandler(mock_sc)
+    try:
+        yh.get('test/endpoint')
+        assert False, "Should have raised RuntimeError"
+    except RuntimeError as e:
+        assert e.args[0] == b'Bad request'
+    assert yh._inflight == {}
+
+
+def test_async_get_coalesces_concurrent_requests():
+    """Test that concurrent awaits of one URI share a single request."""
+    import asyncio
+
+    calls = []
+
+    async def fake_send(method, url, **kwargs):
+        calls.append(url)
+        await asyncio.sleep(0.05)
+        return yhandler._Response(200, b'{"data": "success"}', {})
+
+    yh = yhandler.AsyncYHandler(Mock())
+    yh._send = fake_send
+
+    async def run():
+        return await asyncio.gather(*[yh.get('test/endpoint')
+                                      for _ in range(5)])
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(r == {'data': 'success'} for r in results)
+
+
+def test_get_league_rosters_raw():
+    yh = yhandler.YHandler(Mock())
+    yh.get = Mock(return_value={})
+    yh.get_league_rosters_raw('388.l.27081', week=3)
+    yh.get.assert_called_with('league/388.l.27081/teams/roster;week=3')
+    yh.get_league_rosters_raw('388.l.27081',
+                              day=datetime.date(2019, 10, 7))
+    yh.get.assert_called_with(
+        'league/388.l.27081/teams/roster;date=2019-10-07')
+    yh.get_league_rosters_raw('388.l.27081')
+    yh.get.assert_called_with('league/388.l.27081/teams/roster')
+
+
+def test_get_leagues_by_keys_raw():
+    yh = yhandler.YHandler(Mock())
+    yh.get = Mock(return_value={})
+    yh.get_leagues_by_keys_raw(['388.l.27081', '396.l.21484'],
+                               ['settings', 'standings'])
+    yh.get.assert_called_with(
+        'leagues;league_keys=388.l.27081,396.l.21484;out=settings,standings')
+
+
+def test_get_transactions_raw_paging():
+    yh = yhandler.YHandler(Mock())
+    yh.get = Mock(return_value={})
+    yh.get_transactions_raw('399.l.710921', 'add,drop', 25, start=50)
+    yh.get.assert_called_with(
+        'league/399.l.710921/transactions;types=add,drop;start=50;count=25')
+
+
+# Conditional GET tests.
+
+STANDINGS_URI = 'league/396.l.21484/standings'
+
+
+def test_get_revalidates_with_etag():
+    """Test that a 304 returns the document from the last request."""
+    mock_sc = Mock()
+    fresh = Mock(status_code=200,
+                 headers={'ETag': '"abc"',
+                          'Last-Modified': 'Sun, 18 Oct 2026 10:00:00 GMT'})
+    fresh.content = b'{"data": "success"}'
+    not_modified = Mock(status_code=304, content=b'', headers={})
+    not_modified.json = Mock(side_effect=AssertionError("decoded a 304"))
+    mock_sc.session.get = Mock(side_effect=[fresh, not_modified])
+
+    yh = yhandler.YHandler(mock_sc)
+    (doc, status) = yh.get_with_status(STANDINGS_URI)
+    assert status == yhandler.FRESH
+    assert 'If-None-Match' not in mock_sc.session.get.call_args[1]['headers']
+
+    (doc2, status) = yh.get_with_status(STANDINGS_URI)
+    assert status == yhandler.REVALIDATED
+    assert doc2 is doc
+    headers = mock_sc.session.get.call_args[1]['headers']
+    assert headers['If-None-Match'] == '"abc"'
+    assert headers['If-Modified-Since'] == 'Sun, 18 Oct 2026 10:00:00 GMT'
+    assert headers['Accept-Encoding'] == 'gzip, deflate'
+
+
+def test_get_revalidates_after_eviction():
+    """Test that a 304 is answered even if the entry was evicted in flight."""
+    mock_sc = Mock()
+    fresh = Mock(status_code=200, headers={'ETag': '"abc"'})
+    fresh.content = b'{"data": "success"}'
+    not_modified = Mock(status_code=304, content=b'', headers={})
+    yh = yhandler.YHandler(mock_sc)
+
+    def evict_then_304(*args, **kwargs):
+        # Other URIs pushed the entry out while the request was in flight
+        yh._validated.clear()
+        return not_modified
+    mock_sc.session.get = Mock(return_value=fresh)
+    doc = yh.get(STANDINGS_URI)
+    mock_sc.session.get.side_effect = evict_then_304
+    (doc2, status) = yh.get_with_status(STANDINGS_URI)
+    assert status == yhandler.REVALIDATED
+    assert doc2 is doc
+
+
+def test_get_conditional_off():
+    mock_sc = Mock()
+    fresh = Mock(status_code=200, headers={'ETag': '"abc"'})
+    fresh.content = b'{"data": "success"}'
+    mock_sc.session.get = Mock(return_value=fresh)
+    yh = yhandler.YHandler(mock_sc, conditional=False)
+    yh.get(STANDINGS_URI)
+    yh.get(STANDINGS_URI)
+    assert 'If-None-Match' not in mock_sc.session.get.call_args[1]['headers']
+
+
+def test_get_validators_are_bounded():
+    mock_sc = Mock()
+    fresh = Mock(status_code=200, headers={'ETag': '"abc"'})
+    fresh.content = b'{"data": "success"}'
+    mock_sc.session.get = Mock(return_value=fresh)
+    yh = yhandler.YHandler(mock_sc)
+    yh.MAX_VALIDATED_URIS = 2
+    uris = ['league/396.l.{}/standings'.format(i) for i in range(3)]
+    for uri in uris:
+        yh.get(uri)
+    assert list(yh._validated.keys()) == uris[1:]
+
+
+def test_get_validators_are_bounded_by_bytes():
+    mock_sc = Mock()
+    fresh = Mock(status_code=200, headers={'ETag': '"abc"'})
+    fresh.content = b'{"data": "success"}'
+    mock_sc.session.get = Mock(return_value=fresh)
+    yh = yhandler.YHandler(mock_sc)
+    yh.MAX_VALIDATED_BYTES = 2 * len(fresh.content)
+    uris = ['league/396.l.{}/standings'.format(i) for i in range(3)]
+    for uri in uris:
+        yh.get(uri)
+    assert list(yh._validated.keys()) == uris[1:]
+    assert yh._validated_bytes == 2 * len(fresh.content)
+
+
+def test_get_validators_only_for_polled_resources():
+    mock_sc = Mock()
+    fresh = Mock(status_code=200, headers={'ETag': '"abc"'})
+    fresh.content = b'{"data": "success"}'
+    mock_sc.session.get = Mock(return_value=fresh)
+    yh = yhandler.YHandler(mock_sc)
+    yh.get('league/396.l.21484/players;start=0;count=25')
+    yh.get('test/endpoint')
+    assert len(yh._validated) == 0
+
+
+def test_async_clients_are_closed_with_their_loop():
+    """Test that no client is left open when a handler changes loops."""
+    import asyncio
+    import types
+
+    class ClientSession:
+        def __init__(self, **kwargs):
+            self.closed = False
+
+        async def close(self):
+            self.closed = True
+
+    aiohttp = types.SimpleNamespace(TCPConnector=Mock(),
+                                    ClientTimeout=Mock(),
+                                    ClientSession=ClientSession)
+    yh = yhandler.AsyncYHandler(Mock())
+    with patch.dict('sys.modules', {'aiohttp': aiohttp}):
+        async def client():
+            c = await yh._client_session()
+            assert await yh._client_session() is c
+            return c
+        first = asyncio.run(client())
+        # asyncio.run() closed the client of its loop when it shut down
+        assert first.closed
+        second = asyncio.run(client())
+        assert second is not first and second.closed
+
+        async def client_then_close():
+            c = await yh._client_session()
+            await yh.close()
+            return c
+        assert asyncio.run(client_then_close()).closed
+
+
+def test_async_get_revalidates():
+    import asyncio
+
+    sent = []
+    responses = [yhandler._Response(200, b'{"data": "success"}',
+                                    {'ETag': '"abc"'}),
+                 yhandler._Response(304, b'', {})]
+
+    async def fake_send(method, url, headers=None, **kwargs):
+        sent.append(headers)
+        return responses.pop(0)
+
+    yh = yhandler.AsyncYHandler(Mock())
+    yh._send = fake_send
+
+    async def run():
+        first = await yh.get_with_status(STANDINGS_URI)
+        second = await yh.get_with_status(STANDINGS_URI)
+        return (first, second)
+    ((doc, status), (doc2, status2)) = asyncio.run(run())
+    assert (status, status2) == (yhandler.FRESH, yhandler.REVALIDATED)
+    assert doc2 is doc
+    assert sent[1]['If-None-Match'] == '"abc"'
+
+
+# JSON decoder and raw body tests.
+
+def test_default_json_loads_falls_back_to_stdlib(monkeypatch):
+    monkeypatch.setattr(yhandler, 'FAST_JSON_DECODERS', ('no_such_module',))
+    yhandler.default_json_loads.cache_clear()
+    try:
+        assert yhandler.default_json_loads() is json.loads
+    finally:
+        yhandler.default_json_loads.cache_clear()
+
+
+def test_get_uses_pluggable_decoder():
+    mock_sc = Mock()
+    response = Mock(status_code=200, content=b'{"data": "success"}',
+                    headers={})
+    mock_sc.session.get = Mock(return_value=response)
+    decoded = []
+
+    def loads(body):
+        decoded.append(body)
+        return {'decoded': True}
+    yh = yhandler.YHandler(mock_sc, json_loads=loads)
+    assert yh.get('test/endpoint') == {'decoded': True}
+    assert decoded == [b'{"data": "success"}']
+
+
+def test_get_bytes_skips_decoding():
+    mock_sc = Mock()
+    response = Mock(status_code=200, content=b'{"data": "success"}',
+                    headers={'ETag': '"abc"'})
+    mock_sc.session.get = Mock(return_value=response)
+    yh = yhandler.YHandler(
+        mock_sc, json_loads=Mock(side_effect=AssertionError("decoded")))
+    assert yh.get_bytes('test/endpoint') == b'{"data": "success"}'
+    assert len(yh._validated) == 0
+
+    response.status_code = 500
+    response.content = b'Server error'
+    yh.retry = yhandler.RetryPolicy(max_retries=0)
+    try:
+        yh.get_bytes('test/endpoint')
+        assert False, "expected a RuntimeError"
+    except RuntimeError:
+        pass
+
+
+def test_async_get_bytes():
+    import asyncio
+
+    async def fake_send(method, url, headers=None, **kwargs):
+        return yhandler._Response(200, b'{"data": "success"}', {})
+
+    yh = yhandler.AsyncYHandler(Mock())
+    yh._send = fake_send
+    assert asyncio.run(yh.get_bytes('test/endpoint')) == \
+        b'{"data": "success"}'
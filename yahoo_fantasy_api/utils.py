@@ -1,7 +1,16 @@
-from xml.dom.minidom import Document, Element
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from xml.dom.minidom import Document, Element
 
-def create_element(doc: Document, parent: Element, name: str, text: str) -> None:
+
+def new_document() -> 'Document':
+    # minidom is only loaded once an XML payload is built
+    from xml.dom.minidom import Document
+    return Document()
+
+
+def create_element(doc: 'Document', parent: 'Element', name: str, text: str) -> None:
     element = doc.createElement(name)
     element.appendChild(doc.createTextNode(text))
     parent.appendChild(element)
@@ -1,19 +1,484 @@
 #!/bin/python
 
+import collections
 import datetime
+import functools
+import hashlib
+import importlib
 import json
 import logging
+import random
+import threading
+import time
+import uuid
+import weakref
+
+from yahoo_fantasy_api.cache import CachePolicy
 
 YAHOO_ENDPOINT = 'https://fantasysports.yahooapis.com/fantasy/v2'
 
+# Where the document returned by YHandler.get_with_status came from
+FRESH = 'fresh'
+REVALIDATED = 'revalidated'
+CACHED = 'cached'
+
 logger = logging.getLogger(__name__)
 
 
-class YHandler:
-    """Class that constructs the APIs to send to Yahoo"""
+class Transport:
+    """HTTP connection settings used by YHandler
+
+    The settings are applied to the session of the OAuth context by mounting
+    a pooled adapter on it.  Since every handler for a session talks through
+    the same adapter, the keep-alive connections stay warm across all of the
+    League, Team and Game objects.
+
+    :param pool_maxsize: Maximum number of connections kept per host
+    :type pool_maxsize: int
+    :param pool_connections: Number of host pools to keep
+    :type pool_connections: int
+    :param pool_block: If True, requests wait for a free connection when the
+        pool is exhausted rather than opening a throw away connection
+    :type pool_block: bool
+    :param connect_timeout: Seconds to wait to establish a connection
+    :type connect_timeout: float
+    :param read_timeout: Seconds to wait for the server to send a response
+    :type read_timeout: float
+    :param compress: Ask Yahoo! to gzip the response bodies.  If False, the
+        bodies are asked for uncompressed, which saves the CPU time of
+        decompressing them on a fast link.
+    :type compress: bool
+    """
+
+    def __init__(self, pool_maxsize=10, pool_connections=4, pool_block=False,
+                 connect_timeout=5.0, read_timeout=30.0, compress=True):
+        self.pool_maxsize = pool_maxsize
+        self.pool_connections = pool_connections
+        self.pool_block = pool_block
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.compress = compress
+
+    @property
+    def timeout(self):
+        return (self.connect_timeout, self.read_timeout)
+
+    @property
+    def headers(self):
+        # The HTTP clients ask for gzip on their own, so turning compression
+        # off has to be explicit.
+        if self.compress:
+            return {'Accept-Encoding': 'gzip, deflate'}
+        return {'Accept-Encoding': 'identity'}
+
+    def mount(self, session):
+        """Mount a pooled adapter on the session if not already done
+
+        :param session: Session to mount the adapter on
+        :type session: :class:`requests.Session`
+        :return: The session passed in
+        """
+        if getattr(session, '_yfa_transport', None) is not self:
+            from requests.adapters import HTTPAdapter
+            adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                                  pool_maxsize=self.pool_maxsize,
+                                  pool_block=self.pool_block)
+            session.mount('https://', adapter)
+            session._yfa_transport = self
+        return session
+
+
+DEFAULT_TRANSPORT = Transport()
+
+
+class RateLimiter:
+    """Token bucket that limits the rate requests are sent
+
+    Each request takes a token from the bucket.  Tokens are refilled at a
+    steady rate up to the burst size.  A request that finds the bucket empty
+    waits until its token is refilled.  The limiter is thread safe and can be
+    shared by many handlers.
+
+    :param rate: Number of requests allowed per second
+    :type rate: float
+    :param burst: Maximum number of requests that can be sent back to back.
+        Defaults to the rate, rounded up.
+    :type burst: int
+    """
+
+    def __init__(self, rate, burst=None, clock=time.monotonic):
+        assert(rate > 0), "rate must be positive"
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate + 0.999))
+        self.clock = clock
+        self.tokens = float(self.burst)
+        self.last = clock()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token from the bucket
+
+        :return: Number of seconds the caller must wait before sending
+        :rtype: float
+        """
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.burst,
+                              self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        """Block until a request can be sent"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class RetryPolicy:
+    """Jittered exponential backoff for throttled or failed GET requests
+
+    Yahoo! answers with 999 or 429 when it throttles us.  Those, and server
+    errors, are retried after a delay.  If the response has a Retry-After
+    header that delay is used, otherwise a random delay up to
+    base_delay * 2^attempt (capped at max_delay) is picked.
+
+    :param max_retries: Number of times to retry a request.  0 disables
+        retrying.
+    :type max_retries: int
+    :param base_delay: Backoff in seconds of the first retry
+    :type base_delay: float
+    :param max_delay: Upper bound in seconds of any one backoff
+    :type max_delay: float
+    :param retry_statuses: HTTP status codes that are retried
+    :type retry_statuses: set(int)
+    """
+
+    def __init__(self, max_retries=3, base_delay=1.0, max_delay=60.0,
+                 retry_statuses=(429, 500, 502, 503, 504, 999)):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def should_retry(self, attempt, response):
+        return attempt < self.max_retries and \
+            response.status_code in self.retry_statuses
+
+    def delay(self, attempt, response):
+        """Return the number of seconds to wait before the next attempt"""
+        retry_after = self._retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay,
+                                     self.base_delay * 2 ** attempt))
+
+    def _retry_after(self, response):
+        value = response.headers.get('Retry-After')
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        import email.utils
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return max(0.0, (when - now).total_seconds())
+
+
+# When set, every handler in the process takes a token from this limiter in
+# addition to its own.
+GLOBAL_RATE_LIMITER = None
+
+_shared_handlers_lock = threading.Lock()
+
+
+def get_handler(sc, **options):
+    """Return the YHandler shared by all objects using the session context
+
+    The handler is kept on the session context itself, so it is freed along
+    with the session context.  Game, League and Team objects built without a
+    handler use it.
+
+    >>> yh = get_handler(sc, rate_limiter=RateLimiter(2))
+    >>> yfa.League(sc, '388.l.27081').yhandler is yh
+    True
+
+    :param sc: Fully constructed session context
+    :type sc: :class:`yahoo_oauth.OAuth2`
+    :param options: Arguments of YHandler, such as rate_limiter, retry or
+        cache.  If given, a handler built with them replaces the shared one.
+        Objects built before keep the handler they have.
+    :return: Handler for the session context
+    :rtype: YHandler
+    """
+    return _shared_handler(sc, '_yfa_handler', YHandler, options)
+
+
+def get_async_handler(sc, **options):
+    """Return the AsyncYHandler shared by all async objects using the session
+
+    Like get_handler(), the handler is kept on the session context and is
+    replaced if options are given.  Close it with
+    ``await get_async_handler(sc).close()`` when done with the session.
+
+    :param sc: Fully constructed session context
+    :type sc: :class:`yahoo_oauth.OAuth2`
+    :param options: Arguments of AsyncYHandler
+    :return: Async handler for the session context
+    :rtype: AsyncYHandler
+    """
+    return _shared_handler(sc, '_yfa_async_handler', AsyncYHandler, options)
+
 
-    def __init__(self, sc):
+def _shared_handler(sc, attr, cls, options):
+    with _shared_handlers_lock:
+        handler = getattr(sc, attr, None)
+        if options or not isinstance(handler, cls):
+            handler = cls(sc, **options)
+            try:
+                setattr(sc, attr, handler)
+            except AttributeError:
+                # Session context cannot hold the handler (e.g. None in tests)
+                pass
+        return handler
+
+
+def login_identity(sc):
+    """Return a string that identifies the Yahoo! login of a session context
+
+    It is a hash of the consumer key and refresh token, which stay the same
+    for a login across access token refreshes.
+
+    :param sc: Fully constructed session context
+    :type sc: :class:`yahoo_oauth.OAuth2`
+    :return: The identity or None if the session context has no tokens
+    :rtype: str
+    """
+    (consumer_key, refresh_token) = (getattr(sc, 'consumer_key', None),
+                                     getattr(sc, 'refresh_token', None))
+    if isinstance(consumer_key, str) and isinstance(refresh_token, str):
+        digest = hashlib.sha256(
+            "{}\0{}".format(consumer_key, refresh_token).encode('utf-8'))
+        return digest.hexdigest()[:32]
+    return None
+
+
+# Third party JSON decoders to try, fastest first
+FAST_JSON_DECODERS = ('orjson', 'ujson')
+
+
+@functools.lru_cache(maxsize=None)
+def default_json_loads():
+    """Return the fastest installed function to decode JSON
+
+    orjson and ujson are used if installed; otherwise it falls back to
+    json.loads.  All of them accept the raw bytes of a response body.
+
+    :return: Function that decodes a JSON document from bytes or str
+    """
+    for name in FAST_JSON_DECODERS:
+        try:
+            return importlib.import_module(name).loads
+        except ImportError:
+            continue
+    return json.loads
+
+
+class _Flight:
+    """A GET request in flight that other callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class YHandler:
+    """Class that constructs the APIs to send to Yahoo
+
+    :param sc: Fully constructed session context
+    :type sc: :class:`yahoo_oauth.OAuth2`
+    :param transport: Connection settings.  If None, the module level
+        DEFAULT_TRANSPORT is used.
+    :type transport: Transport
+    :param rate_limiter: Limits the rate of requests sent by this handler.
+        Handlers built with get_handler() are shared per session context, so
+        this acts as a per session limit.  The module level
+        GLOBAL_RATE_LIMITER, if set, is applied on top of it.
+    :type rate_limiter: RateLimiter
+    :param retry: Backoff policy for throttled or failed GET requests.  If
+        None, a default RetryPolicy is used.
+    :type retry: RetryPolicy
+    :param cache: Where to keep responses of GET requests, keyed by the
+        login and the URI.  See :class:`yahoo_fantasy_api.cache.SQLiteCache`.
+        If None, nothing is cached.
+    :param cache_policy: Decides which responses go into the cache and their
+        TTLs.  If None, a default CachePolicy is used.
+    :type cache_policy: :class:`yahoo_fantasy_api.cache.CachePolicy`
+    :param conditional: Remember the ETag and Last-Modified of responses to
+        the polled resources (see VALIDATED_RESOURCES) and send conditional
+        GETs for them.  When Yahoo! answers 304 Not Modified, the document
+        from before is returned without decoding anything.
+    :type conditional: bool
+    :param json_loads: Function that decodes the body of responses.  If
+        None, orjson or ujson is used when installed, else json.loads.  See
+        default_json_loads().
+    :param cache_identity: Identifies the Yahoo! login in the cache keys, so
+        a cache shared by several logins never serves one login's responses
+        to another.  If None, login_identity() of the session context is
+        used.
+    :type cache_identity: str
+    """
+
+    # Resources of the cache policy that are polled, so worth revalidating
+    VALIDATED_RESOURCES = ('settings', 'standings', 'draftresults',
+                           'scoreboard')
+    # Most URIs to keep validators and documents for
+    MAX_VALIDATED_URIS = 64
+    # Most bytes of response bodies to keep documents for
+    MAX_VALIDATED_BYTES = 4 * 1024 * 1024
+
+    def __init__(self, sc, transport=None, rate_limiter=None, retry=None,
+                 cache=None, cache_policy=None, conditional=True,
+                 json_loads=None, cache_identity=None):
         self.sc = sc
+        self.cache_identity = cache_identity
+        self.transport = transport if transport is not None \
+            else DEFAULT_TRANSPORT
+        self.rate_limiter = rate_limiter
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.cache = cache
+        self.cache_policy = cache_policy if cache_policy is not None \
+            else CachePolicy()
+        self.conditional = conditional
+        self.json_loads = json_loads if json_loads is not None \
+            else default_json_loads()
+        self._validated = collections.OrderedDict()
+        self._validated_bytes = 0
+        self._validated_lock = threading.Lock()
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+    def _session(self):
+        """Return the session of the OAuth context with our transport set"""
+        return self.transport.mount(self.sc.session)
+
+    def _cache_key(self, uri):
+        """Return the key of the URI's response in the cache"""
+        if self.cache_identity is None:
+            # Without tokens to go by, the entries are private to the handler
+            self.cache_identity = login_identity(self.sc) or \
+                uuid.uuid4().hex
+        return "{}:{}".format(self.cache_identity, uri)
+
+    def _cache_lookup(self, uri):
+        """Return the cached JSON document for the URI or None"""
+        if self.cache is None or not self.cache_policy.cacheable(uri):
+            return None
+        body = self.cache.get(self._cache_key(uri))
+        if body is None:
+            return None
+        return self.json_loads(body)
+
+    def _cache_store(self, uri, response, jresp):
+        """Store the response in the cache if the policy allows"""
+        if self.cache is None:
+            return
+        ttl = self.cache_policy.ttl(uri, jresp)
+        if ttl is not None:
+            self.cache.set(self._cache_key(uri), response.content, ttl)
+
+    def _conditional_headers(self, uri):
+        """Return the request headers, with the validators we have for uri
+
+        :return: The headers and the validator entry they were built from,
+            or None if there is no entry.  The entry is what a 304 to these
+            headers is answered from, even if it is evicted in the meantime.
+        :rtype: tuple(dict, tuple)
+        """
+        headers = dict(self.transport.headers)
+        with self._validated_lock:
+            entry = self._validated.get(uri)
+        if entry is not None:
+            (etag, last_modified, _, _) = entry
+            if etag is not None:
+                headers['If-None-Match'] = etag
+            if last_modified is not None:
+                headers['If-Modified-Since'] = last_modified
+        return (headers, entry)
+
+    def _revalidated(self, uri, entry, response):
+        """Return the document from before if the response is a 304 for it
+
+        :param entry: Validator entry that the request's headers came from
+        """
+        if response.status_code != 304 or entry is None:
+            return None
+        with self._validated_lock:
+            if uri in self._validated:
+                self._validated.move_to_end(uri)
+        return entry[2]
+
+    def _remember_validators(self, uri, response, jresp):
+        """Keep the validators of a response to send with the next GET
+
+        Only responses of the polled resources are kept, and no more than
+        MAX_VALIDATED_URIS of them or MAX_VALIDATED_BYTES of their bodies.
+        """
+        if not self.conditional:
+            return
+        (etag, last_modified) = (response.headers.get('ETag'),
+                                 response.headers.get('Last-Modified'))
+        etag = etag if isinstance(etag, str) else None
+        last_modified = last_modified if isinstance(last_modified, str) \
+            else None
+        size = len(response.content)
+        keep = (etag is not None or last_modified is not None) and \
+            size <= self.MAX_VALIDATED_BYTES and \
+            self.cache_policy.resource(uri) in self.VALIDATED_RESOURCES
+        with self._validated_lock:
+            old = self._validated.pop(uri, None)
+            if old is not None:
+                self._validated_bytes -= old[3]
+            if not keep:
+                return
+            self._validated[uri] = (etag, last_modified, jresp, size)
+            self._validated_bytes += size
+            while len(self._validated) > self.MAX_VALIDATED_URIS or \
+                    self._validated_bytes > self.MAX_VALIDATED_BYTES:
+                (_, evicted) = self._validated.popitem(last=False)
+                self._validated_bytes -= evicted[3]
+
+    def _throttle_delay(self):
+        """Take a token from the rate limiters
+
+        :return: Number of seconds to wait before sending the request
+        :rtype: float
+        """
+        delay = 0.0
+        for limiter in (self.rate_limiter, GLOBAL_RATE_LIMITER):
+            if limiter is not None:
+                delay = max(delay, limiter.reserve())
+        return delay
+
+    def _throttle(self):
+        delay = self._throttle_delay()
+        if delay > 0:
+            time.sleep(delay)
 
     def _is_token_expired_error(self, response):
         """Check if the response indicates an expired OAuth token.
@@ -56,6 +521,17 @@ class YHandler:
         :return: Response from the retried request
         :raises: RuntimeError if refresh fails or retry fails
         """
+        self._refresh_token()
+
+        # Retry the original request with the NEW session.
+        method = getattr(self._session(), method_name)
+        return method(*args, **kwargs)
+
+    def _refresh_token(self):
+        """Refresh the OAuth token and rebuild the session with it.
+
+        :raises: RuntimeError if refresh fails
+        """
         # Check if token refresh is available.
         if not hasattr(self.sc, 'refresh_access_token'):
             logger.error("Token expired but refresh not available")
@@ -72,33 +548,132 @@ class YHandler:
             logger.error(f"Failed to refresh OAuth token: {e}", exc_info=True)
             raise RuntimeError(f"Failed to refresh OAuth token: {e}".encode())
 
-        # Retry the original request with the NEW session.
-        method = getattr(self.sc.session, method_name)
-        return method(*args, **kwargs)
-
     def get(self, uri):
         """Send an API request to the URI and return the response as JSON
 
+        Concurrent calls for the same URI are coalesced into one request.
+        Every caller gets the same JSON document back, so it must not be
+        modified.
+
         :param uri: URI of the API to call
         :type uri: str
         :return: JSON document of the response
         :raises: RuntimeError if any response comes back with an error
         """
-        full_url = "{}/{}".format(YAHOO_ENDPOINT, uri)
-        response = self.sc.session.get(full_url, params={'format': 'json'})
+        return self.get_with_status(uri)[0]
 
-        # If token expired, refresh and retry once.
-        if self._is_token_expired_error(response):
-            response = self._refresh_token_and_retry(
-                'get',
-                full_url,
-                params={'format': 'json'}
-            )
+    def get_with_status(self, uri):
+        """Like get(), but also say where the document came from
+
+        The status is FRESH if a new document was downloaded, REVALIDATED if
+        Yahoo! said the document from the last request is still current, or
+        CACHED if it came from the response cache.  A caller that has already
+        parsed a REVALIDATED document can skip parsing it again; it is the
+        same object that was returned before.
+
+        :param uri: URI of the API to call
+        :type uri: str
+        :return: JSON document of the response and its status
+        :rtype: (dict, str)
+        :raises: RuntimeError if any response comes back with an error
+
+        >>> (doc, status) = yh.get_with_status('league/396.l.21484/standings')
+        >>> status
+        'revalidated'
+        """
+        return self._single_flight(uri, self._get, uri)
+
+    def get_bytes(self, uri):
+        """Send an API request to the URI and return the undecoded body
+
+        Use this when the response is only stored or forwarded, since it
+        skips decoding the JSON.  The response cache is read, but a body
+        fetched this way is neither cached nor used for conditional GETs.
+
+        :param uri: URI of the API to call
+        :type uri: str
+        :return: Raw JSON body of the response
+        :rtype: bytes
+        :raises: RuntimeError if any response comes back with an error
 
+        >>> with open('transactions.json', 'wb') as f:
+        ...     f.write(yh.get_bytes('league/396.l.21484/transactions'))
+        """
+        return self._single_flight(('bytes', uri), self._get_bytes, uri)
+
+    def _single_flight(self, key, fetch, uri):
+        """Call fetch(uri), sharing the result with concurrent callers"""
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+        if not leader:
+            return flight.wait()
+
+        try:
+            flight.result = fetch(uri)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            flight.done.set()
+        return flight.result
+
+    def _get(self, uri):
+        cached = self._cache_lookup(uri)
+        if cached is not None:
+            return (cached, CACHED)
+
+        (headers, entry) = self._conditional_headers(uri)
+        response = self._send_get(uri, headers)
+        revalidated = self._revalidated(uri, entry, response)
+        if revalidated is not None:
+            return (revalidated, REVALIDATED)
+        if response.status_code != 200:
+            raise RuntimeError(response.content)
+        jresp = self.json_loads(response.content)
+        self._cache_store(uri, response, jresp)
+        self._remember_validators(uri, response, jresp)
+        return (jresp, FRESH)
+
+    def _get_bytes(self, uri):
+        if self.cache is not None and self.cache_policy.cacheable(uri):
+            body = self.cache.get(self._cache_key(uri))
+            if body is not None:
+                return body
+
+        response = self._send_get(uri, dict(self.transport.headers))
         if response.status_code != 200:
             raise RuntimeError(response.content)
-        jresp = response.json()
-        return jresp
+        return response.content
+
+    def _send_get(self, uri, headers):
+        """Send a GET request, retrying as the retry policy says"""
+        full_url = "{}/{}".format(YAHOO_ENDPOINT, uri)
+        kwargs = {'params': {'format': 'json'},
+                  'headers': headers,
+                  'timeout': self.transport.timeout}
+        attempt = 0
+        while True:
+            self._throttle()
+            response = self._session().get(full_url, **kwargs)
+
+            # If token expired, refresh and retry once.
+            if self._is_token_expired_error(response):
+                response = self._refresh_token_and_retry('get', full_url,
+                                                         **kwargs)
+
+            if not self.retry.should_retry(attempt, response):
+                break
+            delay = self.retry.delay(attempt, response)
+            logger.info(f"GET {uri} returned {response.status_code}, "
+                        f"retrying in {delay:.2f}s")
+            time.sleep(delay)
+            attempt += 1
+        return response
 
     def put(self, uri, data):
         """Calls the PUT method to the uri with a payload
@@ -111,8 +686,10 @@ class YHandler:
         :raises: RuntimeError if any response comes back with an error
         """
         headers = {'Content-Type': 'application/xml'}
-        response = self.sc.session.put("{}/{}".format(YAHOO_ENDPOINT, uri),
-                                       data=data, headers=headers)
+        self._throttle()
+        response = self._session().put("{}/{}".format(YAHOO_ENDPOINT, uri),
+                                       data=data, headers=headers,
+                                       timeout=self.transport.timeout)
 
         # If token expired, refresh and retry once.
         if self._is_token_expired_error(response):
@@ -120,7 +697,8 @@ class YHandler:
                 'put',
                 "{}/{}".format(YAHOO_ENDPOINT, uri),
                 data=data,
-                headers=headers
+                headers=headers,
+                timeout=self.transport.timeout
             )
 
         if response.status_code != 200:
@@ -138,8 +716,10 @@ class YHandler:
         :raises: RuntimeError if any response comes back with an error
         """
         headers = {'Content-Type': 'application/xml'}
-        response = self.sc.session.post("{}/{}".format(YAHOO_ENDPOINT, uri),
-                                        data=data, headers=headers)
+        self._throttle()
+        response = self._session().post("{}/{}".format(YAHOO_ENDPOINT, uri),
+                                        data=data, headers=headers,
+                                        timeout=self.transport.timeout)
 
         # If token expired, refresh and retry once.
         if self._is_token_expired_error(response):
@@ -147,7 +727,8 @@ class YHandler:
                 'post',
                 "{}/{}".format(YAHOO_ENDPOINT, uri),
                 data=data,
-                headers=headers
+                headers=headers,
+                timeout=self.transport.timeout
             )
 
         if response.status_code != 201:
@@ -182,6 +763,19 @@ class YHandler:
             "users/games/leagues?use_login=1&is_available={}&game_types={}&game_codes={}&seasons={}".format(
                 is_available, game_types, game_codes, seasons))
 
+    def get_leagues_by_keys_raw(self, league_keys, resources):
+        """Return the raw JSON when requesting several leagues at once.
+
+        :param league_keys: List of league keys to fetch
+        :type league_keys: list[str]
+        :param resources: Sub-resources to include for each league (e.g.
+            settings, standings, scoreboard)
+        :type resources: list[str]
+        :return: JSON document of the request.
+        """
+        return self.get("leagues;league_keys={};out={}".format(
+            ",".join(league_keys), ",".join(resources)))
+
     def get_teams_by_keys_raw(self, team_keys):
         """Return the raw JSON when requesting details of a team.
 
@@ -242,6 +836,25 @@ class YHandler:
             param = ""
         return self.get("team/{}/roster{}".format(team_key, param))
 
+    def get_league_rosters_raw(self, league_id, week=None, day=None):
+        """Return the raw JSON when requesting the roster of every team
+
+        :param league_id: League ID to get the rosters for
+        :type league_id: str
+        :param week: What week number to request the rosters for?
+        :type week: int
+        :param day: What day number to request the rosters
+        :type day: datetime.date
+        :return: JSON of the request
+        """
+        if week is not None:
+            param = ";week={}".format(week)
+        elif day is not None:
+            param = ";date={}".format(day.strftime("%Y-%m-%d"))
+        else:
+            param = ""
+        return self.get("league/{}/teams/roster{}".format(league_id, param))
+
     def get_scoreboard_raw(self, league_id, week=None):
         """Return the raw JSON when requesting the scoreboard for a week
 
@@ -285,7 +898,7 @@ class YHandler:
             "league/{}/players;start={};count=25;status={}{}/percent_owned".
             format(league_id, start, status, pos_parm))
 
-    def get_player_raw(self, league_id, search=None, ids=None):
+    def get_player_raw(self, league_id, search=None, ids=None, stats=True):
         """Return the raw JSON when requesting player details
 
         :param league_id: League ID to get the player for
@@ -295,6 +908,8 @@ class YHandler:
         :type search: str
         :param ids: Set of player IDs to lookup.  Cannot be used with search.
         :type ids: list
+        :param stats: Include the player stats in the details
+        :type stats: bool
         :return: JSON document of the request.
         """
         if search is not None:
@@ -309,8 +924,8 @@ class YHandler:
         else:
             raise RuntimeError(
                 "Must use search or ids options to filter players.")
-        return self.get("league/{}/players;{}/stats".format(league_id,
-                                                            players_uri))
+        return self.get("league/{}/players;{}{}".format(
+            league_id, players_uri, "/stats" if stats else ""))
 
     def get_percent_owned_raw(self, league_id, player_ids):
         """Return the raw JSON when requesting the percentage owned of players
@@ -380,7 +995,7 @@ class YHandler:
             "league/{}/transactions;team_key={};type={}".format(
                 league_id, team_key, tran_type))
 
-    def get_transactions_raw(self, league_id, tran_types, count):
+    def get_transactions_raw(self, league_id, tran_types, count, start=None):
         """
         Calls GET to retrieve transactions of a given type.
 
@@ -392,11 +1007,15 @@ class YHandler:
         :param count: The number of transactions to retrieve. Leave blank to return all
         transactions
         :type count str
+        :param start: Index of the first transaction to return, counting
+            back from the most recent one.  Used to page through them.
+        :type start: int
         :return: Response from the GET
         """
+        start_param = "" if start is None else ";start={}".format(start)
         return self.get(
-            "league/{}/transactions;types={};count={}".format(
-                league_id, tran_types, count))
+            "league/{}/transactions;types={}{};count={}".format(
+                league_id, tran_types, start_param, count))
 
     def put_transaction(self, transaction_key, xml):
         """
@@ -504,3 +1123,244 @@ class YHandler:
         :return: JSON document of the request.
         """
         return self.get("league/{}/teams".format(league_id))
+
+
+class _Response:
+    """A response whose body has already been read by the async client
+
+    It has the same attributes as a :class:`requests.Response` that YHandler
+    relies on, so the error handling can be shared.
+    """
+
+    def __init__(self, status_code, content, headers):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+
+    def json(self):
+        return json.loads(self.content)
+
+
+async def _close_when_finalized(client):
+    """Async generator that closes client when it is closed itself"""
+    try:
+        yield
+    finally:
+        await client.close()
+
+
+class AsyncYHandler(YHandler):
+    """Asynchronous version of YHandler built on aiohttp
+
+    All of the get_*_raw, put_* and post_* methods are inherited from YHandler
+    and return awaitables.  Many requests can be in flight at once on a single
+    event loop.  Close the handler when done, or use it as an async context
+    manager.
+
+    >>> async with AsyncYHandler(sc) as yh:
+    ...     standings = await yh.get_standings_raw('388.l.27081')
+
+    :param sc: Fully constructed session context.  Its access token is sent
+        as the bearer token of each request.
+    :type sc: :class:`yahoo_oauth.OAuth2`
+    :param transport: Connection settings.  If None, the module level
+        DEFAULT_TRANSPORT is used.
+    :type transport: Transport
+    """
+
+    def __init__(self, sc, transport=None, rate_limiter=None, retry=None,
+                 cache=None, cache_policy=None, conditional=True,
+                 json_loads=None):
+        super().__init__(sc, transport=transport, rate_limiter=rate_limiter,
+                         retry=retry, cache=cache, cache_policy=cache_policy,
+                         conditional=conditional, json_loads=json_loads)
+        # Event loop -> (HTTP client, async generator that closes it)
+        self._clients = weakref.WeakKeyDictionary()
+        self._inflight_tasks = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Close the HTTP client of the running event loop and its connections
+
+        A handler used from several event loops, like the shared one used
+        with successive asyncio.run() calls, has a client per loop.  The
+        clients of the other loops are closed when asyncio.run() shuts their
+        loop down.
+        """
+        import asyncio
+        entry = self._clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[1].aclose()
+
+    async def _client_session(self):
+        import asyncio
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(loop)
+        if entry is not None:
+            return entry[0]
+        try:
+            import aiohttp
+        except ImportError as e:
+            raise ImportError("AsyncYHandler requires the aiohttp "
+                              "package: pip install aiohttp") from e
+        connector = aiohttp.TCPConnector(
+            limit_per_host=self.transport.pool_maxsize)
+        timeout = aiohttp.ClientTimeout(
+            sock_connect=self.transport.connect_timeout,
+            sock_read=self.transport.read_timeout)
+        client = aiohttp.ClientSession(
+            connector=connector, timeout=timeout,
+            headers=self.transport.headers)
+        # The loop closes its async generators when it is shut down, so
+        # starting one that closes the client ties the client to the loop.
+        closer = _close_when_finalized(client)
+        self._clients[loop] = (client, closer)
+        await closer.__anext__()
+        return client
+
+    async def _send(self, method, url, headers=None, **kwargs):
+        headers = dict(headers or {})
+        headers['Authorization'] = 'Bearer {}'.format(self.sc.access_token)
+        client = await self._client_session()
+        async with client.request(
+                method, url, headers=headers, **kwargs) as resp:
+            return _Response(resp.status, await resp.read(), resp.headers)
+
+    async def _send_with_refresh(self, method, url, **kwargs):
+        import asyncio
+        await asyncio.sleep(self._throttle_delay())
+        response = await self._send(method, url, **kwargs)
+
+        # If token expired, refresh and retry once.
+        if self._is_token_expired_error(response):
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._refresh_token)
+            response = await self._send(method, url, **kwargs)
+        return response
+
+    async def get(self, uri):
+        """Send an API request to the URI and return the response as JSON
+
+        Concurrent calls for the same URI are coalesced into one request.
+        Every caller gets the same JSON document back, so it must not be
+        modified.
+
+        :param uri: URI of the API to call
+        :type uri: str
+        :return: JSON document of the response
+        :raises: RuntimeError if any response comes back with an error
+        """
+        return (await self.get_with_status(uri))[0]
+
+    async def get_with_status(self, uri):
+        """Like get(), but also say where the document came from
+
+        See :meth:`YHandler.get_with_status`.
+
+        :rtype: (dict, str)
+        """
+        return await self._single_flight(uri, self._get, uri)
+
+    async def get_bytes(self, uri):
+        """Send an API request to the URI and return the undecoded body
+
+        See :meth:`YHandler.get_bytes`.
+
+        :rtype: bytes
+        """
+        return await self._single_flight(('bytes', uri), self._get_bytes, uri)
+
+    async def _single_flight(self, key, fetch, uri):
+        import asyncio
+        key = (asyncio.get_running_loop(), key)
+        task = self._inflight_tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch(uri))
+            self._inflight_tasks[key] = task
+            task.add_done_callback(
+                lambda t: self._inflight_tasks.pop(key, None))
+        # Shield the shared request so one caller being cancelled doesn't
+        # cancel it for everyone else.
+        return await asyncio.shield(task)
+
+    async def _get(self, uri):
+        cached = self._cache_lookup(uri)
+        if cached is not None:
+            return (cached, CACHED)
+
+        (headers, entry) = self._conditional_headers(uri)
+        response = await self._send_get(uri, headers)
+        revalidated = self._revalidated(uri, entry, response)
+        if revalidated is not None:
+            return (revalidated, REVALIDATED)
+        if response.status_code != 200:
+            raise RuntimeError(response.content)
+        jresp = self.json_loads(response.content)
+        self._cache_store(uri, response, jresp)
+        self._remember_validators(uri, response, jresp)
+        return (jresp, FRESH)
+
+    async def _get_bytes(self, uri):
+        if self.cache is not None and self.cache_policy.cacheable(uri):
+            body = self.cache.get(self._cache_key(uri))
+            if body is not None:
+                return body
+
+        response = await self._send_get(uri, {})
+        if response.status_code != 200:
+            raise RuntimeError(response.content)
+        return response.content
+
+    async def _send_get(self, uri, headers):
+        import asyncio
+        attempt = 0
+        while True:
+            response = await self._send_with_refresh(
+                'GET', "{}/{}".format(YAHOO_ENDPOINT, uri),
+                params={'format': 'json'}, headers=headers)
+            if not self.retry.should_retry(attempt, response):
+                return response
+            delay = self.retry.delay(attempt, response)
+            logger.info(f"GET {uri} returned {response.status_code}, "
+                        f"retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def put(self, uri, data):
+        """Calls the PUT method to the uri with a payload
+
+        :param uri: URI of the API to call
+        :type uri: str
+        :param data: What to pass as the payload
+        :type data: str
+        :return: Response of the request
+        :raises: RuntimeError if any response comes back with an error
+        """
+        response = await self._send_with_refresh(
+            'PUT', "{}/{}".format(YAHOO_ENDPOINT, uri), data=data,
+            headers={'Content-Type': 'application/xml'})
+        if response.status_code != 200:
+            raise RuntimeError(response.content)
+        return response
+
+    async def post(self, uri, data):
+        """Calls the POST method to the URI with a payload
+
+        :param uri: URI of the API to call
+        :type uri: str
+        :param data: What to pass as the payload
+        :type data: str
+        :return: Response of the request
+        :raises: RuntimeError if any response comes back with an error
+        """
+        response = await self._send_with_refresh(
+            'POST', "{}/{}".format(YAHOO_ENDPOINT, uri), data=data,
+            headers={'Content-Type': 'application/xml'})
+        if response.status_code != 201:
+            raise RuntimeError(response.content)
+        return response